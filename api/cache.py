@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CacheEntry:
+    """Valeur mise en cache avec sa date d'expiration."""
+    value: Any
+    expires_at: float
+    stale_until: float
+
+class TTLCache:
+    """Cache LRU borné avec TTL et stale-while-revalidate.
+    
+    Une entrée expirée continue d'être servie (pendant `stale_ttl` secondes)
+    pendant qu'un rafraîchissement tourne en arrière-plan.
+    """
+    
+    def __init__(self, max_size: int = 1024, stale_ttl: float = 300):
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._refresh_tasks: Dict[Hashable, asyncio.Task] = {}
+        
+        # Compteurs
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    async def get_or_load(
+        self,
+        key: Hashable,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Retourne la valeur en cache ou la charge via `loader`.
+        
+        Les valeurs `None` et les exceptions du loader ne sont jamais mises en cache.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        
+        if entry is not None:
+            if now < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._schedule_refresh(key, ttl, loader)
+                return entry.value
+            # Trop ancienne pour être servie
+            del self._entries[key]
+        
+        self.misses += 1
+        value = await loader()
+        self.set(key, value, ttl)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Ajoute ou remplace une entrée."""
+        if value is None:
+            return
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, now + ttl, now + ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Supprime une entrée, ou tout le cache si aucune clé n'est donnée."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refresh_errors": self.refresh_errors,
+            "size": len(self._entries),
+            "refreshing": len(self._refresh_tasks)
+        }
+    
+    async def close(self):
+        """Annule les rafraîchissements en cours."""
+        tasks = list(self._refresh_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_tasks.clear()
+    
+    def _schedule_refresh(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]):
+        """Lance un rafraîchissement en arrière-plan (un seul par clé)."""
+        if key in self._refresh_tasks:
+            return
+        self._refresh_tasks[key] = asyncio.create_task(self._refresh(key, ttl, loader))
+    
+    async def _refresh(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]):
+        try:
+            self.set(key, await loader(), ttl)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Échec du rafraîchissement du cache pour {key!r}: {e}")
+        finally:
+            self._refresh_tasks.pop(key, None)
@@ -1,68 +1,281 @@
+import asyncio
+import hashlib
+import json
+import math
 import aiohttp
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Tuple
+from utils.json_stream import decode_object, iter_json_array
+from utils.singleflight import SingleFlight
+from .cache import TTLCache
 from .models import MinecraftPlayer, MinecraftPlayerStats, KillData, KillEvent
+from .resilience import RETRY_STATUSES, CircuitBreaker, backoff_delay, create_session
+
+@dataclass
+class ConditionalEntry:
+    """Dernière réponse d'un endpoint : validateurs HTTP, empreinte du corps et modèles construits."""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    value: Any
+
+# Taille des morceaux lus lors du décodage en flux
+STREAM_CHUNK_SIZE = 64 * 1024
+# Sections de /v1/player décodées seulement à la demande
+PLAYER_RAW_SECTIONS = frozenset({"sessions", "info"})
 
 class APIError(Exception):
     """Exception personnalisée pour les erreurs API."""
     pass
 
+class CircuitOpenError(APIError):
+    """L'API Plan est considérée comme indisponible : la requête n'a pas été envoyée."""
+    
+    def __init__(self, retry_in: float):
+        super().__init__(f"API Plan indisponible, nouvel essai dans {math.ceil(retry_in)}s")
+        self.retry_in = retry_in
+
 class MinecraftAPIClient:
     """Client pour l'API Minecraft avec gestion d'erreurs robuste."""
     
-    def __init__(self, base_url: str = "http://localhost:8804"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8804",
+        max_concurrency: int = 10,
+        players_ttl: float = 30,
+        player_stats_ttl: float = 60,
+        cache: Optional[TTLCache] = None,
+        session_options: Optional[Dict[str, Any]] = None,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.5,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
         self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = True
+        # Pool de connexions et timeouts (voir `create_session`)
+        self.session_options = session_options or {}
+        # Retries des GET (idempotents) et disjoncteur
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        
+        # Cache des réponses : TTL par endpoint
+        self.cache = cache if cache is not None else TTLCache()
+        self.cache_ttls = {
+            "playersTable": players_ttl,
+            "player": player_stats_ttl
+        }
+        # Coalescence des requêtes identiques en vol
+        self._inflight = SingleFlight()
+        # Requêtes conditionnelles : dernière réponse par endpoint
+        self._conditional: Dict[tuple, ConditionalEntry] = {}
+        self.conditional_stats = {"not_modified": 0, "unchanged": 0, "parsed": 0}
+    
+    def attach_session(self, session: aiohttp.ClientSession):
+        """Utilise une session partagée (pool de connexions commun), non fermée par ce client."""
+        self._session = session
+        self._owns_session = False
     
     async def __aenter__(self):
         """Contexte manager pour l'ouverture de session."""
-        self._session = aiohttp.ClientSession()
+        if self._session is None:
+            self._session = create_session(**self.session_options)
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Contexte manager pour la fermeture de session."""
-        if self._session:
+        await self.cache.close()
+        if self._session and self._owns_session:
             await self._session.close()
+        self._session = None
+    
+    async def get_players(self, refresh: bool = False) -> List[MinecraftPlayer]:
+        """Récupère la liste des joueurs (mise en cache).
+        
+        `refresh=True` ignore le cache et force un rechargement.
+        """
+        if not self._session:
+            raise APIError("Session non initialisée. Utilisez 'async with' ou appelez __aenter__")
+        
+        return await self._cached(("playersTable",), "playersTable", self._fetch_players, refresh)
     
-    async def get_players(self) -> List[MinecraftPlayer]:
-        """Récupère la liste des joueurs."""
+    async def get_player_stats(self, player_uuid: str, refresh: bool = False) -> Optional[MinecraftPlayerStats]:
+        """Récupère les statistiques d'un joueur (mises en cache).
+        
+        `refresh=True` ignore le cache et force un rechargement.
+        """
         if not self._session:
             raise APIError("Session non initialisée. Utilisez 'async with' ou appelez __aenter__")
-            
-        async with self._session.get(f"{self.base_url}/v1/playersTable") as response:
-            if response.status != 200:
-                raise APIError(f"Erreur {response.status}: Impossible de récupérer les joueurs")
-            
-            data = await response.json()
-            players_data = data.get("players", [])
-            
-            return [
-                MinecraftPlayer(
-                    player_uuid=player["playerUUID"],
-                    player_name=player["playerName"],
-                    activity_index=player["activityIndex"],
-                    playtime_active=player["playtimeActive"],
-                    session_count=player["sessionCount"],
-                    last_seen=player["lastSeen"],
-                    registered=player["registered"],
-                    ping_average=player["pingAverage"],
-                    ping_max=player["pingMax"],
-                    ping_min=player["pingMin"]
-                )
-                for player in players_data
-            ]
-    
-    async def get_player_stats(self, player_uuid: str) -> Optional[MinecraftPlayerStats]:
-        """Récupère les statistiques d'un joueur."""
+        
+        return await self._cached(
+            ("player", player_uuid),
+            "player",
+            lambda: self._fetch_player_stats(player_uuid),
+            refresh
+        )
+    
+    async def _cached(self, key: tuple, endpoint: str, fetch, refresh: bool = False):
+        """Passe par le cache (avec coalescence des requêtes identiques)."""
+        ttl = self.cache_ttls[endpoint]
+        loader = lambda: self._inflight.do(key, fetch)
+        
+        if refresh:
+            value = await loader()
+            self.cache.set(key, value, ttl)
+            return value
+        return await self.cache.get_or_load(key, ttl, loader)
+    
+    async def _request(self, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Any, bytes]:
+        """GET avec retries (backoff à jitter) et disjoncteur.
+        
+        Retourne (statut, en-têtes, corps décompressé). Les erreurs réseau,
+        timeouts et statuts transitoires (429/5xx) sont retentés ; si toutes
+        les tentatives échouent, lève APIError. Lève CircuitOpenError sans
+        envoyer de requête tant que Plan est considéré indisponible.
+        """
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError(self.circuit_breaker.retry_in)
+        
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(backoff_delay(attempt, self.retry_base_delay))
+            try:
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status not in RETRY_STATUSES:
+                        body = await response.read()
+                        self.circuit_breaker.record_success()
+                        return response.status, response.headers, body
+                    error = f"Erreur {response.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+        
+        self.circuit_breaker.record_failure()
+        raise APIError(f"API Plan injoignable après {self.max_retries + 1} tentative(s) ({error})")
+    
+    async def _get_conditional(self, key: tuple, url: str, parse: Callable[[Any], Any], error: str):
+        """GET conditionnel : réutilise les modèles déjà construits si la réponse n'a pas changé.
+        
+        Les validateurs (ETag/Last-Modified) de la dernière réponse de `key`
+        sont renvoyés ; sur 304, le résultat précédent est réutilisé. Sans
+        validateurs, une empreinte du corps évite de redécoder un contenu identique.
+        """
+        entry = self._conditional.get(key)
+        headers = {}
+        if entry is not None and entry.url == url:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        
+        status, response_headers, body = await self._request(url, headers)
+        if status == 304 and entry is not None:
+            self.conditional_stats["not_modified"] += 1
+            return entry.value
+        if status != 200:
+            raise APIError(f"Erreur {status}: {error}")
+        
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if entry is not None and entry.digest == digest:
+            self.conditional_stats["unchanged"] += 1
+            value = entry.value
+        else:
+            self.conditional_stats["parsed"] += 1
+            try:
+                value = parse(json.loads(body))
+            except (ValueError, KeyError, TypeError) as e:
+                # Page d'erreur HTML d'un proxy, réponse tronquée ou champ manquant
+                raise APIError(f"Réponse invalide: {error} ({e})") from e
+        self._conditional[key] = ConditionalEntry(
+            url=url,
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+            digest=digest,
+            value=value
+        )
+        return value
+    
+    async def _fetch_players(self) -> List[MinecraftPlayer]:
+        """Télécharge la liste des joueurs depuis l'API."""
+        return await self._get_conditional(
+            ("playersTable",),
+            f"{self.base_url}/v1/playersTable",
+            self._parse_players,
+            "Impossible de récupérer les joueurs"
+        )
+    
+    @staticmethod
+    def _parse_players(data: Dict[str, Any]) -> List[MinecraftPlayer]:
+        return [MinecraftAPIClient._parse_player(player) for player in data.get("players", [])]
+    
+    @staticmethod
+    def _parse_player(player: Dict[str, Any]) -> MinecraftPlayer:
+        return MinecraftPlayer(
+            player_uuid=player["playerUUID"],
+            player_name=player["playerName"],
+            activity_index=player["activityIndex"],
+            playtime_active=player["playtimeActive"],
+            session_count=player["sessionCount"],
+            last_seen=player["lastSeen"],
+            registered=player["registered"],
+            ping_average=player["pingAverage"],
+            ping_max=player["pingMax"],
+            ping_min=player["pingMin"]
+        )
+    
+    async def iter_players(self) -> AsyncIterator[MinecraftPlayer]:
+        """Parcourt les joueurs en décodant `/v1/playersTable` au fil de la réception.
+        
+        Ni le corps complet ni la liste des joueurs ne sont gardés en mémoire :
+        à réserver aux traitements d'ensemble (réconciliation, instantanés).
+        Contourne le cache et n'est pas retenté une fois le flux commencé.
+        """
         if not self._session:
             raise APIError("Session non initialisée. Utilisez 'async with' ou appelez __aenter__")
-            
-        async with self._session.get(f"{self.base_url}/v1/player?player={player_uuid}") as response:
-            if response.status != 200:
-                return None
-            
-            data = await response.json()
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError(self.circuit_breaker.retry_in)
+        
+        try:
+            async with self._session.get(f"{self.base_url}/v1/playersTable") as response:
+                if response.status != 200:
+                    raise APIError(f"Erreur {response.status}: Impossible de récupérer les joueurs")
+                self.circuit_breaker.record_success()
+                async for player in iter_json_array(response.content.iter_chunked(STREAM_CHUNK_SIZE), "players"):
+                    yield self._parse_player(player)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.circuit_breaker.record_failure()
+            raise APIError(f"Erreur lors de la lecture des joueurs: {type(e).__name__} {e}") from e
+        except (ValueError, KeyError, TypeError) as e:
+            raise APIError(f"Réponse invalide pour les joueurs: {type(e).__name__} {e}") from e
+    
+    def iter_player_stats(
+        self,
+        players: AsyncIterable[MinecraftPlayer],
+        max_concurrency: Optional[int] = None,
+        refresh: bool = False
+    ) -> AsyncIterator[Tuple[MinecraftPlayer, Optional[MinecraftPlayerStats], Optional[str]]]:
+        """Statistiques des joueurs d'un flux, au fur et à mesure (voir `stream_player_stats`)."""
+        return stream_player_stats(
+            lambda uuid: self.get_player_stats(uuid, refresh=refresh),
+            players,
+            max_concurrency or self.max_concurrency
+        )
+    
+    async def _fetch_player_stats(self, player_uuid: str) -> Optional[MinecraftPlayerStats]:
+        """Télécharge les statistiques d'un joueur depuis l'API.
+        
+        `sessions` et `info` sont gardés bruts : seul `kill_data` est décodé.
+        """
+        status, _, body = await self._request(f"{self.base_url}/v1/player?player={player_uuid}")
+        if status != 200:
+            return None
+        try:
+            data = decode_object(body.decode(), PLAYER_RAW_SECTIONS)
             kill_data = data.get("kill_data", {})
-            
             return MinecraftPlayerStats(
                 kill_data=KillData(
                     player_kills_total=kill_data.get("player_kills_total", 0),
@@ -72,33 +285,85 @@ class MinecraftAPIClient:
                     player_kdr_total=kill_data.get("player_kdr_total", "0"),
                     mob_kills_total=kill_data.get("mob_kills_total", 0)
                 ),
-                sessions=data.get("sessions", []),
-                info=data.get("info", {}),
+                sessions=data.get("sessions", b"[]"),
+                info=data.get("info", b"{}"),
                 timestamp=data.get("timestamp", 0)
             )
+        except (ValueError, AttributeError, TypeError) as e:
+            # UnicodeDecodeError et JSONDecodeError sont des ValueError
+            raise APIError(f"Réponse invalide pour le joueur {player_uuid} ({type(e).__name__}: {e})") from e
     
-    async def get_kills(self, server: str = "Server 1") -> List[KillEvent]:
-        """Récupère les événements de kill récents."""
+    async def get_kills(self, server: str = "Server 1", since: Optional[int] = None) -> List[KillEvent]:
+        """Récupère les événements de kill récents.
+        
+        `since` (timestamp ms) est transmis à Plan, qui peut l'ignorer :
+        l'appelant doit toujours filtrer lui-même les kills reçus.
+        """
         if not self._session:
             raise APIError("Session non initialisée. Utilisez 'async with' ou appelez __aenter__")
         
+        return await self._inflight.do(
+            ("kills", server, since),
+            lambda: self._fetch_kills(server, since)
+        )
+    
+    async def _fetch_kills(self, server: str, since: Optional[int] = None) -> List[KillEvent]:
+        """Télécharge les événements de kill depuis l'API."""
         import urllib.parse
         encoded_server = urllib.parse.quote(server)
+        url = f"{self.base_url}/v1/kills?server={encoded_server}"
+        if since is not None:
+            url += f"&since={since}"
+        
+        return await self._get_conditional(
+            ("kills", server),
+            url,
+            self._parse_kills,
+            "Impossible de récupérer les kills"
+        )
+    
+    @staticmethod
+    def _parse_kills(data: Dict[str, Any]) -> List[KillEvent]:
+        kills_data = data.get("kills", [])
         
-        async with self._session.get(f"{self.base_url}/v1/kills?server={encoded_server}") as response:
-            if response.status != 200:
-                raise APIError(f"Erreur {response.status}: Impossible de récupérer les kills")
-            
-            data = await response.json()
-            kills_data = data.get("kills", [])
-            
-            return [
-                KillEvent(
-                    killer=kill.get("killer", "Unknown"),
-                    victim=kill.get("victim", "Unknown"),
-                    weapon=kill.get("weapon", "Unknown"),
-                    distance=kill.get("distance", 0.0),
-                    timestamp=kill.get("timestamp", 0)
-                )
-                for kill in kills_data
-            ] 
\ No newline at end of file
+        return [
+            KillEvent(
+                killer=kill.get("killer", "Unknown"),
+                victim=kill.get("victim", "Unknown"),
+                weapon=kill.get("weapon", "Unknown"),
+                distance=kill.get("distance", 0.0),
+                timestamp=kill.get("timestamp", 0)
+            )
+            for kill in kills_data
+        ]
+
+async def stream_player_stats(
+    fetch: Callable[[str], Awaitable[Optional[MinecraftPlayerStats]]],
+    players: AsyncIterable[MinecraftPlayer],
+    max_concurrency: int
+) -> AsyncIterator[Tuple[MinecraftPlayer, Optional[MinecraftPlayerStats], Optional[str]]]:
+    """Récupère les statistiques d'un flux de joueurs avec au plus `max_concurrency` requêtes en vol.
+    
+    Produit (joueur, stats, erreur) dans l'ordre d'achèvement ; seules les
+    requêtes en cours sont gardées en mémoire.
+    """
+    async def fetch_one(player: MinecraftPlayer):
+        try:
+            stats = await fetch(player.player_uuid)
+        except (APIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return player, None, f"{type(e).__name__}: {e}"
+        return player, stats, None if stats is not None else "Statistiques indisponibles"
+    
+    pending = set()
+    try:
+        async for player in players:
+            if len(pending) >= max_concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            pending.add(asyncio.create_task(fetch_one(player)))
+        for task in asyncio.as_completed(pending):
+            yield await task
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,14 +1,53 @@
+import dataclasses
+import json
+import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
+def slotted(cls):
+    """Ajoute `__slots__` à une dataclass (équivalent de `slots=True`, absent avant Python 3.10).
+    
+    Sans `__dict__` par instance, un modèle gardé par milliers en cache
+    occupe nettement moins de mémoire (voir `python -m api.models_benchmark`).
+    """
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = names
+    # Les valeurs par défaut restent dans la signature du __init__ généré
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
 class RankingType(Enum):
     """Types de classement disponibles."""
     KILLS = "kills"
     DEATHS = "deaths"
     KD_RATIO = "kd_ratio"
+    PLAYTIME = "playtime"
+    ACTIVITY = "activity"
+    PING = "ping"
+    SESSIONS = "sessions"
+    
+    @property
+    def from_players_table(self) -> bool:
+        """Classement servi par `/v1/playersTable` seul (aucune requête par joueur)."""
+        return self in (RankingType.PLAYTIME, RankingType.ACTIVITY, RankingType.PING, RankingType.SESSIONS)
+
+class RankingPeriod(Enum):
+    """Périodes de classement disponibles."""
+    ALL_TIME = "total"
+    DAY = "24h"
+    WEEK = "7d"
+    MONTH = "30d"
+    
+    @property
+    def hours(self) -> Optional[int]:
+        """Durée de la période en heures (None pour le classement global)."""
+        return {"24h": 24, "7d": 7 * 24, "30d": 30 * 24}.get(self.value)
 
+@slotted
 @dataclass
 class KillEvent:
     """Représente un événement de kill."""
@@ -17,8 +56,10 @@ class KillEvent:
     weapon: str
     timestamp: int
     distance: float = 0.0
+    server: Optional[str] = None  # renseigné quand plusieurs serveurs sont suivis
 
-@dataclass
+@slotted
+@dataclass(frozen=True)
 class KillData:
     """Données de kills d'un joueur."""
     player_kills_total: int
@@ -28,15 +69,59 @@ class KillData:
     player_kdr_total: str
     mob_kills_total: int
 
-@dataclass
 class MinecraftPlayerStats:
-    """Statistiques d'un joueur Minecraft."""
-    kill_data: KillData
-    sessions: List[Dict[str, Any]]
-    info: Dict[str, Any]
-    timestamp: int
+    """Statistiques d'un joueur Minecraft.
+    
+    `sessions` et `info` (volumineux, rarement lus) peuvent être fournis
+    sous forme de bytes JSON bruts : ils ne sont décodés qu'au premier accès.
+    """
+    
+    __slots__ = ("kill_data", "timestamp", "_sessions", "_info")
+    
+    def __init__(
+        self,
+        kill_data: KillData,
+        sessions: Union[bytes, List[Dict[str, Any]]],
+        info: Union[bytes, Dict[str, Any]],
+        timestamp: int
+    ):
+        self.kill_data = kill_data
+        self.timestamp = timestamp
+        self._sessions = sessions
+        self._info = info
+    
+    def __repr__(self) -> str:
+        return f"MinecraftPlayerStats(kill_data={self.kill_data!r}, timestamp={self.timestamp!r})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MinecraftPlayerStats):
+            return NotImplemented
+        return (self.kill_data, self.timestamp, self.sessions, self.info) == \
+            (other.kill_data, other.timestamp, other.sessions, other.info)
+    
+    @property
+    def raw_sessions(self) -> Union[bytes, List[Dict[str, Any]]]:
+        """`sessions` tel que stocké : bytes JSON tant qu'il n'a pas été lu."""
+        return self._sessions
+    
+    @property
+    def raw_info(self) -> Union[bytes, Dict[str, Any]]:
+        return self._info
+    
+    @property
+    def sessions(self) -> List[Dict[str, Any]]:
+        if isinstance(self._sessions, bytes):
+            self._sessions = json.loads(self._sessions)
+        return self._sessions
+    
+    @property
+    def info(self) -> Dict[str, Any]:
+        if isinstance(self._info, bytes):
+            self._info = json.loads(self._info)
+        return self._info
 
-@dataclass
+@slotted
+@dataclass(frozen=True)
 class MinecraftPlayer:
     """Informations d'un joueur Minecraft."""
     player_uuid: str
@@ -48,4 +133,36 @@ class MinecraftPlayer:
     registered: str
     ping_average: int
     ping_max: int
-    ping_min: int 
\ No newline at end of file
+    ping_min: int
+
+@dataclass
+class ServerHealth:
+    """État de santé d'un serveur (ou d'une instance Plan) interrogé.
+    
+    Après une erreur, le serveur est mis de côté pendant un délai
+    exponentiel (`retry_at`) pour ne pas ralentir les autres.
+    """
+    name: str
+    consecutive_errors: int = 0
+    last_error: Optional[str] = None
+    last_success_at: Optional[float] = None
+    last_duration: float = 0.0
+    retry_at: float = 0.0
+    
+    @property
+    def available(self) -> bool:
+        """Indique si le serveur peut être interrogé maintenant."""
+        return time.monotonic() >= self.retry_at
+    
+    def record_success(self, duration: float):
+        self.consecutive_errors = 0
+        self.last_error = None
+        self.last_success_at = time.time()
+        self.last_duration = duration
+        self.retry_at = 0.0
+    
+    def record_error(self, error: str, duration: float, base_delay: float = 5, max_delay: float = 300):
+        self.consecutive_errors += 1
+        self.last_error = error
+        self.last_duration = duration
+        self.retry_at = time.monotonic() + min(max_delay, base_delay * 2 ** (self.consecutive_errors - 1))
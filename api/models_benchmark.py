@@ -0,0 +1,108 @@
+"""Mesure mémoire des modèles : `python -m api.models_benchmark [nombre]`.
+
+Compare les modèles compacts de `api.models` à des dataclasses classiques
+(avec `__dict__` et `sessions`/`info` décodés d'emblée).
+"""
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+from api.models import KillData, KillEvent, MinecraftPlayer, MinecraftPlayerStats
+from utils.json_stream import decode_object
+
+@dataclass
+class _DictKillEvent:
+    killer: str
+    victim: str
+    weapon: str
+    timestamp: int
+    distance: float = 0.0
+    server: str = None
+
+@dataclass
+class _DictPlayer:
+    player_uuid: str
+    player_name: str
+    activity_index: float
+    playtime_active: int
+    session_count: int
+    last_seen: str
+    registered: str
+    ping_average: int
+    ping_max: int
+    ping_min: int
+
+@dataclass
+class _DictKillData:
+    player_kills_total: int
+    deaths_total: int
+    player_kills_7d: int
+    deaths_7d: int
+    player_kdr_total: str
+    mob_kills_total: int
+
+@dataclass
+class _DictPlayerStats:
+    kill_data: _DictKillData
+    sessions: List[Dict[str, Any]]
+    info: Dict[str, Any]
+    timestamp: int
+
+def _player_body(i: int) -> str:
+    """Réponse /v1/player réaliste : quelques dizaines de sessions."""
+    return json.dumps({
+        "kill_data": {
+            "player_kills_total": i % 50, "deaths_total": i % 30, "player_kills_7d": i % 5,
+            "deaths_7d": i % 3, "player_kdr_total": "1.67", "mob_kills_total": i % 400
+        },
+        "sessions": [
+            {"start": 1700000000000 + s, "end": 1700003600000 + s, "server": "Server 1",
+             "world_times": {"world": 3000000, "world_nether": 600000}, "player_kills": [], "mob_kills": s % 20}
+            for s in range(40)
+        ],
+        "info": {"uuid": f"uuid-{i}", "name": f"Player{i}", "online": False, "best_ping": 12, "worst_ping": 180},
+        "timestamp": 1700000000000
+    })
+
+def _build_kill(cls, i: int):
+    return cls(f"Killer{i}", f"Victim{i}", "Diamond Sword", 1700000000000 + i, 12.5)
+
+def _build_player(cls, i: int):
+    return cls(f"uuid-{i}", f"Player{i}", 1.5, 3600000 + i, i % 100, "2024-01-01", "2023-01-01", 40, 120, 10)
+
+def _build_stats_eager(body: str):
+    data = json.loads(body)
+    return _DictPlayerStats(_DictKillData(**data["kill_data"]), data["sessions"], data["info"], data["timestamp"])
+
+def _build_stats_lazy(body: str):
+    data = decode_object(body, {"sessions", "info"})
+    return MinecraftPlayerStats(KillData(**data["kill_data"]), data["sessions"], data["info"], data["timestamp"])
+
+def _measure(build: Callable[[int], Any], count: int) -> float:
+    """Octets par objet (allocations retenues)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    bodies = [_player_body(i) for i in range(min(count, 2_000))]
+    cases = [
+        ("KillEvent", lambda i: _build_kill(_DictKillEvent, i), lambda i: _build_kill(KillEvent, i), count),
+        ("MinecraftPlayer", lambda i: _build_player(_DictPlayer, i), lambda i: _build_player(MinecraftPlayer, i), count),
+        ("MinecraftPlayerStats", lambda i: _build_stats_eager(bodies[i]), lambda i: _build_stats_lazy(bodies[i]), len(bodies))
+    ]
+    
+    print(f"{'Modèle':<22}{'dataclass':>12}{'compact':>12}{'gain':>8}")
+    for name, classic, compact, n in cases:
+        before = _measure(classic, n)
+        after = _measure(compact, n)
+        print(f"{name:<22}{before:>10.0f} o{after:>10.0f} o{1 - after / before:>8.0%}")
+
+if __name__ == "__main__":
+    main()
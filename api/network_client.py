@@ -0,0 +1,202 @@
+import asyncio
+import dataclasses
+import logging
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import aiohttp
+from utils.json_stream import concat_arrays
+from .minecraft_client import MinecraftAPIClient, APIError, stream_player_stats
+from .resilience import create_session
+from .models import KillData, KillEvent, MinecraftPlayer, MinecraftPlayerStats, ServerHealth
+
+logger = logging.getLogger(__name__)
+
+class NetworkAPIClient:
+    """Agrège plusieurs instances Plan d'un réseau (BungeeCord/Velocity).
+    
+    Expose la même interface que `MinecraftAPIClient`. Les instances
+    partagent une seule session HTTP (pool de connexions commun) et sont
+    interrogées en parallèle, chacune avec son délai maximal et son état de
+    santé : une instance lente ou en erreur est mise de côté sans retarder
+    les autres, et les résultats des instances disponibles sont fusionnés.
+    """
+    
+    def __init__(
+        self,
+        clients: Dict[str, MinecraftAPIClient],
+        servers: Dict[str, str],
+        timeout: float = 10,
+        session_options: Optional[Dict[str, Any]] = None
+    ):
+        # clients : URL de l'instance -> client ; servers : nom du serveur -> URL de son instance
+        self.clients = clients
+        self.servers = servers
+        self.timeout = timeout
+        self.health = {base_url: ServerHealth(base_url) for base_url in clients}
+        self.session_options = session_options or {}
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self):
+        """Ouvre la session partagée par toutes les instances."""
+        self._session = create_session(**self.session_options)
+        for client in self.clients.values():
+            client.attach_session(self._session)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Ferme les caches des instances puis la session partagée."""
+        for client in self.clients.values():
+            await client.__aexit__(exc_type, exc_val, exc_tb)
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
+    def client_for(self, server: str) -> MinecraftAPIClient:
+        """Client de l'instance Plan qui expose `server`."""
+        try:
+            return self.clients[self.servers[server]]
+        except KeyError:
+            raise APIError(f"Serveur inconnu : {server}") from None
+    
+    async def _gather(
+        self,
+        call: Callable[[MinecraftAPIClient], Awaitable],
+        bounded: bool = True
+    ) -> List[Tuple[str, object]]:
+        """Appelle chaque instance disponible en parallèle ; retourne [(url, résultat)] des succès.
+        
+        `bounded=False` retire le délai par instance (appels longs par nature).
+        """
+        timeout = self.timeout if bounded else None
+        
+        async def run(base_url: str, client: MinecraftAPIClient):
+            health = self.health[base_url]
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(call(client), timeout)
+            except (APIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                health.record_error(f"{type(e).__name__}: {e}", time.perf_counter() - started)
+                logger.warning(f"Instance Plan {base_url} indisponible: {type(e).__name__} {e}")
+                return None
+            health.record_success(time.perf_counter() - started)
+            return base_url, result
+        
+        available = [(url, client) for url, client in self.clients.items() if self.health[url].available]
+        if not available:
+            raise APIError("Aucune instance Plan disponible")
+        results = await asyncio.gather(*(run(url, client) for url, client in available))
+        results = [result for result in results if result is not None]
+        if not results:
+            raise APIError("Toutes les instances Plan ont échoué")
+        return results
+    
+    async def get_players(self, refresh: bool = False) -> List[MinecraftPlayer]:
+        """Liste des joueurs de toutes les instances (fusionnés par UUID)."""
+        results = await self._gather(lambda client: client.get_players(refresh=refresh))
+        
+        merged: Dict[str, MinecraftPlayer] = {}
+        for _, players in results:
+            merge_players(merged, players)
+        return list(merged.values())
+    
+    async def get_player_stats(self, player_uuid: str, refresh: bool = False) -> Optional[MinecraftPlayerStats]:
+        """Statistiques d'un joueur, additionnées sur toutes les instances."""
+        results = await self._gather(lambda client: client.get_player_stats(player_uuid, refresh=refresh))
+        return merge_player_stats([stats for _, stats in results if stats is not None])
+    
+    async def iter_players(self) -> AsyncIterator[MinecraftPlayer]:
+        """Parcourt les joueurs de toutes les instances, fusionnés par UUID comme `get_players`.
+        
+        Chaque réponse est décodée en flux, une instance après l'autre : seuls
+        les joueurs sont gardés en mémoire, jamais les corps de réponse. Avec
+        une seule instance, les joueurs sont produits au fil de la réception.
+        """
+        if len(self.clients) == 1:
+            async for player in next(iter(self.clients.values())).iter_players():
+                yield player
+            return
+        
+        merged: Dict[str, MinecraftPlayer] = {}
+        succeeded = False
+        for base_url, client in self.clients.items():
+            health = self.health[base_url]
+            if not health.available:
+                continue
+            started = time.perf_counter()
+            try:
+                # Joueurs d'une instance fusionnés seulement si son flux est complet
+                players = [player async for player in client.iter_players()]
+            except (APIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                health.record_error(f"{type(e).__name__}: {e}", time.perf_counter() - started)
+                logger.warning(f"Instance Plan {base_url} indisponible: {type(e).__name__} {e}")
+                continue
+            health.record_success(time.perf_counter() - started)
+            merge_players(merged, players)
+            succeeded = True
+        if not succeeded:
+            raise APIError("Toutes les instances Plan ont échoué")
+        for player in merged.values():
+            yield player
+    
+    def iter_player_stats(
+        self,
+        players: AsyncIterable[MinecraftPlayer],
+        max_concurrency: Optional[int] = None,
+        refresh: bool = False
+    ) -> AsyncIterator[Tuple[MinecraftPlayer, Optional[MinecraftPlayerStats], Optional[str]]]:
+        """Statistiques additionnées sur toutes les instances, au fur et à mesure."""
+        return stream_player_stats(
+            lambda uuid: self.get_player_stats(uuid, refresh=refresh),
+            players,
+            max_concurrency or max(client.max_concurrency for client in self.clients.values())
+        )
+    
+    async def get_kills(self, server: str = "Server 1", since: Optional[int] = None) -> List[KillEvent]:
+        """Kills d'un serveur, demandés à l'instance Plan qui l'expose."""
+        return await self.client_for(server).get_kills(server, since=since)
+
+def merge_players(merged: Dict[str, MinecraftPlayer], players: Iterable[MinecraftPlayer]):
+    """Ajoute des joueurs à `merged` (par UUID), en cumulant temps de jeu et sessions."""
+    for player in players:
+        known = merged.get(player.player_uuid)
+        if known is None:
+            merged[player.player_uuid] = player
+        else:
+            merged[player.player_uuid] = dataclasses.replace(
+                known,
+                activity_index=max(known.activity_index, player.activity_index),
+                playtime_active=known.playtime_active + player.playtime_active,
+                session_count=known.session_count + player.session_count
+            )
+
+def merge_player_stats(stats: List[MinecraftPlayerStats]) -> Optional[MinecraftPlayerStats]:
+    """Additionne les statistiques d'un même joueur provenant de plusieurs instances.
+    
+    Les sessions encore brutes sont concaténées sans être décodées.
+    """
+    if not stats:
+        return None
+    if len(stats) == 1:
+        return stats[0]
+    
+    kills = sum(s.kill_data.player_kills_total for s in stats)
+    deaths = sum(s.kill_data.deaths_total for s in stats)
+    return MinecraftPlayerStats(
+        kill_data=KillData(
+            player_kills_total=kills,
+            deaths_total=deaths,
+            player_kills_7d=sum(s.kill_data.player_kills_7d for s in stats),
+            deaths_7d=sum(s.kill_data.deaths_7d for s in stats),
+            player_kdr_total=f"{kills / deaths:.2f}" if deaths else str(kills),
+            mob_kills_total=sum(s.kill_data.mob_kills_total for s in stats)
+        ),
+        sessions=_merge_sessions(stats),
+        info=stats[0].raw_info,
+        timestamp=max(s.timestamp for s in stats)
+    )
+
+def _merge_sessions(stats: List[MinecraftPlayerStats]):
+    raw = [s.raw_sessions for s in stats]
+    if all(isinstance(sessions, bytes) for sessions in raw):
+        return concat_arrays(raw)
+    return [session for s in stats for session in s.sessions]
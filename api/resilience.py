@@ -0,0 +1,102 @@
+import random
+import time
+from typing import Optional
+import aiohttp
+
+# Statuts HTTP transitoires : la requête GET est retentée
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Compression négociée avec Plan : brotli seulement si aiohttp peut la décoder
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+def create_session(
+    timeout: float = 30,
+    connect_timeout: float = 5,
+    limit: int = 100,
+    limit_per_host: int = 20,
+    keepalive_timeout: float = 30,
+    dns_cache_ttl: int = 300
+) -> aiohttp.ClientSession:
+    """Crée une session HTTP avec un pool de connexions borné, keep-alive, cache DNS
+    et réponses compressées (gzip, brotli si disponible).
+    
+    `timeout` borne la durée totale d'une requête, `connect_timeout`
+    l'établissement de la connexion (pool compris).
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_cache_ttl
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout, connect=connect_timeout),
+        headers={"Accept-Encoding": ACCEPT_ENCODING}
+    )
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 10) -> float:
+    """Délai avant la tentative `attempt` (1, 2, ...) : backoff exponentiel à jitter complet."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+class CircuitBreaker:
+    """Disjoncteur : après `failure_threshold` échecs consécutifs, les appels
+    échouent immédiatement pendant `reset_timeout` secondes.
+    
+    Passé ce délai, une seule requête d'essai est autorisée (semi-ouvert) :
+    son succès referme le circuit, son échec le rouvre.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_started_at: Optional[float] = None
+    
+    @property
+    def retry_in(self) -> float:
+        """Secondes avant la prochaine requête d'essai (0 si le circuit est fermé)."""
+        if self.state == self.CLOSED:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+    
+    def allow(self) -> bool:
+        """Indique si une requête peut partir maintenant."""
+        if self.state == self.CLOSED:
+            return True
+        
+        now = time.monotonic()
+        if self.state == self.OPEN and now >= self.opened_at + self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_started_at = None
+        if self.state == self.HALF_OPEN:
+            # Une seule requête d'essai à la fois (relancée si elle a été perdue)
+            if self._probe_started_at is None or now - self._probe_started_at > self.reset_timeout:
+                self._probe_started_at = now
+                return True
+        
+        self.rejected += 1
+        return False
+    
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_started_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_started_at = None
@@ -1,15 +1,22 @@
+import time
+STARTED_AT = time.perf_counter()  # Mesure du temps de démarrage
+
+import logging
 import os
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from config.settings import bot_config
+
+# Chargement des variables d'environnement (avant la configuration, lue à l'import)
+load_dotenv()
+
+from config.settings import bot_config, webhook_config
+from services.kill_webhook import KillWebhookServer
 from utils.helpers import setup_logging
 
 # Configuration du logging
 setup_logging()
-
-# Chargement des variables d'environnement
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 class DiscordBot(commands.Bot):
     """Bot Discord avec architecture modulaire."""
@@ -17,13 +24,28 @@ class DiscordBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.all()
         super().__init__(command_prefix=bot_config.command_prefix, intents=intents)
+        self.kill_webhook = None
     
     async def setup_hook(self):
         """Configuration initiale du bot."""
         # Chargement des Cogs
+        cogs_started = time.perf_counter()
         await self.load_extension("cogs.minecraft")
         await self.load_extension("cogs.moderation")
         print("Cogs chargés avec succès.")
+        logger.info(f"Cogs chargés en {time.perf_counter() - cogs_started:.2f}s")
+        
+        # Réception des kills poussés par le serveur Minecraft (optionnelle)
+        if webhook_config.enabled:
+            self.kill_webhook = KillWebhookServer(
+                self._ingest_pushed_kills,
+                host=webhook_config.host,
+                port=webhook_config.port,
+                path=webhook_config.path,
+                secret=webhook_config.secret,
+                max_batch=webhook_config.max_batch
+            )
+            await self.kill_webhook.start()
         
         # Synchronisation des commandes
         try:
@@ -31,6 +53,19 @@ class DiscordBot(commands.Bot):
             print(f"Commandes synchronisées avec succès - {len(self.tree.get_commands())} commandes")
         except Exception as e:
             print(f"Erreur lors de la synchronisation des commandes : {e}")
+    
+    async def close(self):
+        """Arrête le webhook avant la fermeture du bot."""
+        if self.kill_webhook:
+            await self.kill_webhook.stop()
+        await super().close()
+    
+    async def _ingest_pushed_kills(self, kills):
+        """Relaie les kills du webhook au cog Minecraft (résolu à chaque appel : rechargement possible)."""
+        cog = self.get_cog("MinecraftCog")
+        if cog is None:
+            return None
+        return await cog.ingest_pushed_kills(kills)
 
 # Instance du bot
 bot = DiscordBot()
@@ -41,6 +76,7 @@ bot = DiscordBot()
 async def on_ready():
     """Événement déclenché quand le bot est prêt."""
     print(f'Bot connecté en tant que {bot.user}')
+    logger.info(f"Démarrage terminé en {time.perf_counter() - STARTED_AT:.2f}s")
 
 @bot.event
 async def on_message(message: discord.Message):
@@ -1,38 +1,86 @@
+import asyncio
+import logging
+import os
+import re
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Optional, List
-from api.minecraft_client import MinecraftAPIClient
-from api.models import MinecraftPlayerStats, RankingType
+from typing import Optional, List, Tuple
+from api.minecraft_client import APIError, MinecraftAPIClient
+from api.network_client import NetworkAPIClient
+from api.cache import TTLCache
+from api.resilience import CircuitBreaker
+from api.models import KillEvent, MinecraftPlayerStats, RankingType, RankingPeriod
 from utils.helpers import handle_api_errors
 from services.killfeed_service import KillFeedService
-from services.google_sheets_service import GoogleSheetsService
-from views.minecraft_views import MinecraftViews
+from services.kill_cursor import KillCursor
+from services.kill_sources import KillSource
+from services.event_bus import KillFilter
+from services.poll_scheduler import AdaptivePollScheduler
+from services.google_sheets_service import SheetsWriteBehindQueue
+from services.player_index_service import PlayerIndexService
+from services.leaderboard_service import LeaderboardService
+from services.ranking_table import rank_players
+from services.stats_warmer import StatsWarmer
+from services.event_store_service import EventStoreService
+from services.windowed_stats_service import WindowedStatsService
+from views.minecraft_views import MinecraftViews, PageCache, PaginatedView
 from enum import Enum
-from config.settings import bot_config
+from config.settings import bot_config, api_config, storage_config, killfeed_config, webhook_config
+
+logger = logging.getLogger(__name__)
 
 class MinecraftCog(commands.Cog):
     """Cog pour les commandes Minecraft."""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.api_client = MinecraftAPIClient()
+        self.api_client = self._create_api_client()
         self.killfeed = None
-        self.sheets_service = GoogleSheetsService()
+        # Service Google Sheets partagé, connecté à la première écriture
+        self.sheets_writer = SheetsWriteBehindQueue()
+        self.player_index = PlayerIndexService()
+        self.leaderboard = LeaderboardService()
+        # Instantané des joueurs et statistiques rafraîchi en arrière-plan : les commandes n'attendent pas Plan
+        self.stats_warmer = StatsWarmer(api_config.stats_refresh_interval, api_config.max_concurrency)
+        self.stats_warmer.add_listener(self.leaderboard.reconcile)
+        self.stats_warmer.add_listener(lambda snapshot: self.player_index.update(snapshot.players))
+        self.event_store = EventStoreService(
+            storage_config.database_path,
+            flush_interval=storage_config.flush_interval,
+            batch_size=storage_config.batch_size,
+            snapshot_interval=storage_config.snapshot_interval
+        )
+        # Historique des statistiques enregistré à partir des instantanés (pas de requêtes propres)
+        self.stats_warmer.add_listener(self.event_store.record_snapshot)
+        self.windowed_stats = WindowedStatsService()
+        # Pages rendues des classements et de la liste des joueurs, par version des données
+        self.page_cache = PageCache()
+        # Tâches de démarrage, annulées au déchargement
+        self._tasks: List[asyncio.Task] = []
     
     async def cog_load(self):
         """Appelé quand le Cog est chargé."""
         await self.api_client.__aenter__()
-        # Configuration du killfeed avec le canal configuré
-        if bot_config.minecraft_killfeed_channel_id:
-            channel = self.bot.get_channel(bot_config.minecraft_killfeed_channel_id)
-            if channel:
-                self.killfeed = KillFeedService(self.api_client, channel)
+        self.sheets_writer.start()
+        self.stats_warmer.start(self.api_client)
+        await self.event_store.open()
+        self._tasks.append(asyncio.create_task(self._load_local_history()))
+        # Une seule ingestion pour tous les canaux abonnés
+        self.killfeed = self._create_killfeed()
+        self._tasks.append(asyncio.create_task(self._subscribe_configured_channel()))
     
     async def cog_unload(self):
         """Appelé quand le Cog est déchargé."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
         if self.killfeed:
             await self.killfeed.stop_monitoring()
+        await self.stats_warmer.stop()
+        await self.event_store.close()
+        await self.sheets_writer.stop()
         await self.api_client.__aexit__(None, None, None)
 
     
@@ -42,9 +90,16 @@ class MinecraftCog(commands.Cog):
     async def list_minecraft_players(self, interaction: discord.Interaction):
         await interaction.response.defer()
         
-        players = await self.api_client.get_players()
-        embed = MinecraftViews.create_player_list_embed(players)
-        await interaction.followup.send(embed=embed)
+        snapshot = self.stats_warmer.snapshot
+        key = ("players", snapshot.version) if snapshot is not None else None
+        pages = self.page_cache.get(key)
+        if pages is None:
+            if snapshot is not None:
+                pages = MinecraftViews.create_player_list_pages(snapshot.players, snapshot.taken_at)
+            else:
+                pages = MinecraftViews.create_player_list_pages(await self.api_client.get_players())
+            self.page_cache.put(key, pages)
+        await PaginatedView(pages, interaction.user.id).send(interaction)
     
 
 
@@ -54,11 +109,8 @@ class MinecraftCog(commands.Cog):
     async def stats_minecraft_for_player(self, interaction: discord.Interaction, player_name: str):
         await interaction.response.defer()
         
-        players = await self.api_client.get_players()
-        player = next(
-            (p for p in players if p.player_name.lower() == player_name.lower()),
-            None
-        )
+        await self._refresh_player_index()
+        player = self.player_index.lookup(player_name)
         
         if not player:
             await interaction.followup.send(
@@ -67,7 +119,12 @@ class MinecraftCog(commands.Cog):
             )
             return
         
-        stats = await self.api_client.get_player_stats(player.player_uuid)
+        snapshot = self.stats_warmer.snapshot
+        stats = snapshot.player_stats(player.player_uuid) if snapshot else None
+        data_as_of = snapshot.taken_at if stats is not None else None
+        if stats is None:
+            # Joueur absent de l'instantané (nouveau venu ou premier rafraîchissement en cours)
+            stats = await self.api_client.get_player_stats(player.player_uuid)
         if not stats:
             await interaction.followup.send(
                 f"Aucune statistique trouvée pour {player_name}.",
@@ -75,24 +132,60 @@ class MinecraftCog(commands.Cog):
             )
             return
         
-        embed = MinecraftViews.create_stats_embed(player_name, stats)
+        embed = MinecraftViews.create_stats_embed(player.player_name, stats, data_as_of)
         await interaction.followup.send(embed=embed)
+    
+    @stats_minecraft_for_player.autocomplete("player_name")
+    async def player_name_autocomplete(
+        self,
+        interaction: discord.Interaction,
+        current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Propose les noms de joueurs commençant par la saisie."""
+        try:
+            await self._refresh_player_index()
+        except Exception as e:
+            # L'autocomplétion ne doit jamais échouer : on sert l'index existant
+            logger.warning(f"Rafraîchissement de l'index des joueurs impossible: {e}")
+        
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.player_index.autocomplete(current)
+        ]
 
 
 
     ### Ranking ###
     @app_commands.command(name="minecraftranking", description="Affiche le classement des joueurs Minecraft")
     @app_commands.describe(
-        ranking_type="Type de classement (kd_ratio/kills/deaths)",
-        limit="Nombre de joueurs à afficher (défaut: 10, max: 25)"
+        ranking_type="Type de classement (kd_ratio/kills/deaths/playtime/activity/ping/sessions)",
+        limit="Nombre de joueurs par page (défaut: 10, max: 25)",
+        period="Période du classement (défaut: total)",
+        hours="Période personnalisée en heures (remplace 'period', max: 720)"
     )
     @app_commands.choices(ranking_type=[
         app_commands.Choice(name="Ratio K/D", value="kd_ratio"),
         app_commands.Choice(name="Nombre de Kills", value="kills"),
-        app_commands.Choice(name="Nombre de Morts", value="deaths")
+        app_commands.Choice(name="Nombre de Morts", value="deaths"),
+        app_commands.Choice(name="Temps de jeu", value="playtime"),
+        app_commands.Choice(name="Activité", value="activity"),
+        app_commands.Choice(name="Ping", value="ping"),
+        app_commands.Choice(name="Sessions", value="sessions")
+    ], period=[
+        app_commands.Choice(name="Total", value="total"),
+        app_commands.Choice(name="24 heures", value="24h"),
+        app_commands.Choice(name="7 jours", value="7d"),
+        app_commands.Choice(name="30 jours", value="30d")
     ])
     @handle_api_errors
-    async def minecraft_ranking(self, interaction: discord.Interaction, ranking_type: str, limit: int = 10):
+    async def minecraft_ranking(
+        self,
+        interaction: discord.Interaction,
+        ranking_type: str,
+        limit: int = 10,
+        period: str = "total",
+        hours: Optional[int] = None
+    ):
         await interaction.response.defer()
         
         if limit < 1 or limit > 25:
@@ -106,115 +199,297 @@ class MinecraftCog(commands.Cog):
             ranking_enum = RankingType(ranking_type)
         except ValueError:
             await interaction.followup.send(
-                "Type de classement invalide. Utilisez 'kd_ratio', 'kills' ou 'deaths'.",
+                "Type de classement invalide. Utilisez 'kd_ratio', 'kills', 'deaths', 'playtime', "
+                "'activity', 'ping' ou 'sessions'.",
                 ephemeral=True
             )
             return
         
-        ranking_data = await self.get_players_ranking(ranking_enum, limit)
+        try:
+            period_enum = RankingPeriod(period)
+        except ValueError:
+            await interaction.followup.send(
+                "Période invalide. Utilisez 'total', '24h', '7d' ou '30d'.",
+                ephemeral=True
+            )
+            return
         
-        # Mettre à jour le classement dans Google Sheets
-        print("Mise à jour du classement dans Google Sheets...")
-        self.sheets_service.update_ranking(ranking_data)
-        print("Mise à jour du classement dans Google Sheets terminée.")
+        window_hours = hours if hours is not None else period_enum.hours
+        if window_hours is not None and ranking_enum.from_players_table:
+            await interaction.followup.send(
+                "Ce classement est calculé sur toute la durée : la période n'est pas disponible.",
+                ephemeral=True
+            )
+            return
+        if window_hours is not None and not 1 <= window_hours <= self.windowed_stats.retention_hours:
+            await interaction.followup.send(
+                f"La période doit être entre 1 et {self.windowed_stats.retention_hours} heures.",
+                ephemeral=True
+            )
+            return
         
-        embed = MinecraftViews.create_ranking_embed(ranking_data, ranking_enum)
-        await interaction.followup.send(embed=embed)
+        key = self._ranking_pages_key(ranking_enum, window_hours, limit)
+        pages = self.page_cache.get(key)
+        if pages is None:
+            if ranking_enum.from_players_table:
+                ranking_data, data_as_of = await self.get_players_table_ranking(ranking_enum, None)
+                period_label = None
+            elif window_hours is not None:
+                # Classement par période : calculé localement, sans appel à Plan
+                self.windowed_stats.prune()
+                ranking_data = self.windowed_stats.top(ranking_enum, window_hours, None)
+                period_label = self._format_period(window_hours)
+                data_as_of = None
+            else:
+                ranking_data = await self.get_players_ranking(ranking_enum, None)
+                period_label = None
+                # Totaux du dernier instantané, complétés en direct par le killfeed
+                data_as_of = self.leaderboard.last_reconcile
+                
+                # Publier le classement complet dans Google Sheets (écriture différée)
+                self.sheets_writer.update_ranking(ranking_data)
+            
+            pages = MinecraftViews.create_ranking_pages(ranking_data, ranking_enum, limit, period_label, data_as_of)
+            self.page_cache.put(key, pages)
+        
+        await PaginatedView(pages, interaction.user.id).send(interaction)
 
 
 
 
     ### Killfeed ###
-    @app_commands.command(name="killfeed", description="Active/désactive le suivi des kills dans le canal configuré")
-    @app_commands.describe(action="Action à effectuer (start/stop)")
+    @app_commands.command(name="killfeed", description="Abonne/désabonne ce canal au suivi des kills")
+    @app_commands.describe(
+        action="Action à effectuer (start/stop/status)",
+        players="Ne suivre que ces joueurs, tueurs ou victimes (séparés par des virgules)",
+        weapons="Ne suivre que ces armes (séparées par des virgules, ex. bow, sword)",
+        min_distance="Distance minimale du kill (mètres)"
+    )
     @app_commands.choices(action=[
         app_commands.Choice(name="Démarrer", value="start"),
-        app_commands.Choice(name="Arrêter", value="stop")
+        app_commands.Choice(name="Arrêter", value="stop"),
+        app_commands.Choice(name="Statut", value="status")
     ])
+    @app_commands.guild_only()
     @handle_api_errors
-    async def toggle_killfeed(self, interaction: discord.Interaction, action: str):
-        """Active/désactive le suivi des kills dans le canal configuré."""
+    async def toggle_killfeed(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        players: Optional[str] = None,
+        weapons: Optional[str] = None,
+        min_distance: Optional[app_commands.Range[float, 0, 1000]] = None
+    ):
+        """Abonne/désabonne ce canal au suivi des kills, avec des filtres optionnels."""
         await interaction.response.defer()
-
-        # Vérifier si le canal est configuré
-        if not bot_config.minecraft_killfeed_channel_id:
-            await interaction.followup.send("❌ Le canal de killfeed n'est pas configuré dans les paramètres.", ephemeral=True)
+        
+        if action.lower() == "status":
+            subscriptions = self.killfeed.bus.subscriptions(interaction.guild_id) if self.killfeed else []
+            embed = MinecraftViews.create_killfeed_status_embed(
+                is_active=bool(self.killfeed and self.killfeed.is_monitoring),
+                is_configured=self.killfeed is not None,
+                interval=self.killfeed.scheduler.interval if self.killfeed else None,
+                poll_histogram=self.killfeed.scheduler.histogram() if self.killfeed else None,
+                pipeline_stats=self.killfeed.pipeline.stats() if self.killfeed and self.killfeed.pipeline else None,
+                server_health=[source.health for source in self.killfeed.sources] if self.killfeed else None,
+                subscriptions=[
+                    (
+                        f"<#{subscription.key}>",
+                        subscription.kill_filter.describe(),
+                        subscription.delivered,
+                        # Kills perdus faute de place dans la file d'envoi du canal
+                        self.killfeed.dropped_kills(subscription.key)
+                    )
+                    for subscription in subscriptions
+                ]
+            )
+            await interaction.followup.send(embed=embed)
             return
-
-        # Vérifier si l'utilisateur est dans le bon canal
-        if interaction.channel_id != bot_config.minecraft_killfeed_channel_id:
-            channel = self.bot.get_channel(bot_config.minecraft_killfeed_channel_id)
-            if channel:
-                await interaction.followup.send(f"❌ Cette commande doit être utilisée dans le canal {channel.mention}.", ephemeral=True)
-            else:
-                await interaction.followup.send("❌ Le canal configuré n'est pas accessible.", ephemeral=True)
+        
+        if not self.killfeed:
+            await interaction.followup.send("❌ Le killfeed n'est pas initialisé.", ephemeral=True)
             return
-
+        
+        # Abonner ou désabonner un canal est réservé à ceux qui peuvent gérer les salons
+        if not interaction.user.guild_permissions.manage_channels:
+            await interaction.followup.send(
+                "❌ La permission « Gérer les salons » est requise pour démarrer ou arrêter le killfeed.",
+                ephemeral=True
+            )
+            return
+        
         if action.lower() == "start":
-            if not self.killfeed:
-                self.killfeed = KillFeedService(self.api_client, interaction.channel)
-            success, message = await self.killfeed.start_monitoring()
+            kill_filter = KillFilter.create(
+                players=players.split(",") if players else None,
+                weapons=weapons.split(",") if weapons else None,
+                min_distance=min_distance
+            )
+            success, message = await self.killfeed.subscribe_channel(interaction.channel, kill_filter)
         
         elif action.lower() == "stop":
-            if not self.killfeed:
-                await interaction.followup.send("❌ Le killfeed n'est pas initialisé.", ephemeral=True)
-                return
-            success, message = await self.killfeed.stop_monitoring()
+            success, message = await self.killfeed.unsubscribe_channel(interaction.channel)
         
         else:
-            await interaction.followup.send("❌ Action invalide. Utilisez 'start' ou 'stop'.", ephemeral=True)
+            await interaction.followup.send("❌ Action invalide. Utilisez 'start', 'stop' ou 'status'.", ephemeral=True)
             return
 
         await interaction.followup.send("✅ " + message if success else "❌ " + message)
     
     # Méthodes utilitaires
-    async def get_players_ranking(self, ranking_type: RankingType, limit: int = 10) -> List[tuple]:
-        """Récupère le classement des joueurs selon le type spécifié."""
-        players = await self.api_client.get_players()
-        ranking_data = []
+    def _create_api_client(self):
+        """Client Plan : direct pour une seule instance, agrégé pour un réseau de plusieurs instances."""
+        def create(base_url: str) -> MinecraftAPIClient:
+            return MinecraftAPIClient(
+                base_url,
+                max_concurrency=api_config.max_concurrency,
+                players_ttl=api_config.players_cache_ttl,
+                player_stats_ttl=api_config.player_stats_cache_ttl,
+                cache=TTLCache(max_size=api_config.cache_max_size, stale_ttl=api_config.cache_stale_ttl),
+                session_options=api_config.session_options(),
+                max_retries=api_config.max_retries,
+                retry_base_delay=api_config.retry_base_delay,
+                circuit_breaker=CircuitBreaker(api_config.circuit_failure_threshold, api_config.circuit_reset_timeout)
+            )
         
-        for player in players:
-            stats = await self.api_client.get_player_stats(player.player_uuid)
-            if stats and stats.kill_data:
-                kill_data = stats.kill_data
-                score = self.calculate_score(
-                    kill_data.player_kills_total,
-                    kill_data.deaths_total,
-                    ranking_type
-                )
-                
-                ranking_data.append((
-                    player.player_name,
-                    kill_data.player_kills_total,
-                    kill_data.deaths_total,
-                    score
-                ))
-        
-        ranking_data.sort(
-            key=lambda x: self.get_sort_key(x[3], ranking_type),
-            reverse=True
+        instances = api_config.plan_instances()
+        if len(instances) == 1:
+            return create(instances[0])
+        return NetworkAPIClient(
+            {base_url: create(base_url) for base_url in instances},
+            {server.name: server.base_url or api_config.minecraft_base_url for server in api_config.servers},
+            timeout=api_config.server_timeout,
+            session_options=api_config.session_options()
+        )
+    
+    def _create_kill_sources(self) -> List[KillSource]:
+        """Un flux de kills par serveur configuré, avec son propre point de reprise."""
+        sources = []
+        for server in api_config.servers:
+            cursor_path = storage_config.kill_cursor_path
+            if len(api_config.servers) > 1:
+                root, ext = os.path.splitext(cursor_path)
+                cursor_path = f"{root}-{re.sub(r'[^A-Za-z0-9_-]+', '_', server.name)}{ext}"
+            sources.append(KillSource(server.name, self.api_client, KillCursor(cursor_path), api_config.server_timeout))
+        return sources
+    
+    def _create_killfeed(self) -> KillFeedService:
+        """Crée le service de killfeed et y branche le leaderboard et le stockage."""
+        min_interval = killfeed_config.min_interval
+        initial_interval = killfeed_config.initial_interval
+        if webhook_config.enabled:
+            # Les kills arrivent par le webhook : le polling ne sert qu'à réconcilier
+            min_interval = initial_interval = webhook_config.fallback_interval
+        killfeed = KillFeedService(
+            self._create_kill_sources(),
+            self.sheets_writer,
+            AdaptivePollScheduler(
+                min_interval=min_interval,
+                max_interval=max(killfeed_config.max_interval, min_interval),
+                initial_interval=initial_interval,
+                backoff_factor=killfeed_config.backoff_factor,
+                error_factor=killfeed_config.error_factor,
+                jitter=killfeed_config.jitter
+            ),
+            queue_size=killfeed_config.pipeline_queue_size,
+            workers={
+                "enrich": killfeed_config.enrich_workers,
+                "render": killfeed_config.render_workers
+            }
         )
+        killfeed.add_kill_listener(self.leaderboard.record_kill)
+        killfeed.add_kill_sink(self.event_store.add_kill)
+        killfeed.add_kill_listener(self.windowed_stats.record_kill)
+        return killfeed
+    
+    async def _subscribe_configured_channel(self):
+        """Abonne le canal de killfeed configuré (sans filtre) une fois le bot connecté."""
+        if not bot_config.minecraft_killfeed_channel_id:
+            return
+        await self.bot.wait_until_ready()
+        channel = self.bot.get_channel(bot_config.minecraft_killfeed_channel_id)
+        if channel:
+            _, message = await self.killfeed.subscribe_channel(channel)
+            logger.info(message)
+    
+    async def ingest_pushed_kills(self, kills: List[KillEvent]) -> Optional[int]:
+        """Transmet au killfeed les kills reçus par le webhook (None si le killfeed est inactif)."""
+        if not self.killfeed:
+            return None
+        return await self.killfeed.ingest(kills)
+    
+    def _ranking_pages_key(self, ranking_type: RankingType, window_hours: Optional[int], page_size: int) -> Optional[tuple]:
+        """Clé des pages rendues d'un classement, None si ses données n'ont pas de version.
+        
+        Les classements playersTable suivent la version de l'instantané, ceux
+        de combat celle du leaderboard (instantané + kills en direct). Les
+        périodes glissantes et les calculs directs ne sont pas mis en cache.
+        """
+        if window_hours is not None:
+            return None
+        if ranking_type.from_players_table:
+            snapshot = self.stats_warmer.snapshot
+            return (ranking_type, page_size, "snapshot", snapshot.version) if snapshot is not None else None
+        if self.leaderboard.is_ready:
+            return (ranking_type, page_size, "leaderboard", self.leaderboard.version)
+        return None
+    
+    async def _refresh_player_index(self):
+        """Index des joueurs : tenu à jour par les instantanés, sinon rechargé depuis Plan."""
+        if self.stats_warmer.snapshot is None:
+            await self.player_index.refresh(self.api_client, api_config.players_cache_ttl)
+    
+    async def _load_local_history(self):
+        """Importe l'historique /v1/kills au premier démarrage puis charge les périodes."""
+        try:
+            if await self.event_store.count_kills() == 0:
+                await self.event_store.backfill_servers(
+                    self.api_client, [server.name for server in api_config.servers]
+                )
+            await self.event_store.flush()
+            await self.windowed_stats.load(self.event_store)
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement de l'historique des kills: {e}")
+    
+    async def get_players_ranking(self, ranking_type: RankingType, limit: Optional[int] = 10) -> List[tuple]:
+        """Récupère le classement des joueurs selon le type spécifié (complet si `limit` est None).
+        
+        Servi par le leaderboard matérialisé, initialisé par le premier
+        instantané du `StatsWarmer` : avant celui-ci, la commande l'attend
+        plutôt que d'interroger Plan joueur par joueur en parallèle du warmer.
+        Si le leaderboard n'a pas pu être réconcilié, la table en colonnes
+        de l'instantané sert de repli.
+        """
+        if not self.leaderboard.is_ready:
+            try:
+                snapshot = await self.stats_warmer.wait_snapshot(api_config.stats_wait_timeout)
+            except asyncio.TimeoutError:
+                detail = f" ({self.stats_warmer.last_error})" if self.stats_warmer.last_error else ""
+                raise APIError(f"Statistiques des joueurs pas encore disponibles{detail}")
+            if not self.leaderboard.is_ready:
+                return snapshot.ranking.top(ranking_type, limit)
+        return self.leaderboard.top(ranking_type, limit)
+    
+    async def get_players_table_ranking(
+        self,
+        ranking_type: RankingType,
+        limit: Optional[int] = 10
+    ) -> Tuple[List[Tuple[str, float]], Optional[float]]:
+        """Classement temps de jeu/activité/ping/sessions et date des données.
         
-        return ranking_data[:limit]
-    
-    def calculate_score(self, kills: int, deaths: int, ranking_type: RankingType) -> float:
-        """Calcule le score selon le type de classement."""
-        if ranking_type == RankingType.KD_RATIO:
-            if deaths > 0:
-                return kills / deaths
-            elif kills > 0:
-                return float('inf')
-            return 0.0
-        elif ranking_type == RankingType.KILLS:
-            return kills
-        else:  # DEATHS
-            return deaths
-    
-    def get_sort_key(self, score: float, ranking_type: RankingType) -> float:
-        """Retourne la clé de tri selon le type de classement."""
-        if ranking_type == RankingType.KD_RATIO:
-            return score if score != float('inf') else 999999
-        return score
+        Une seule réponse `/v1/playersTable` suffit : celle du dernier
+        instantané, sinon celle du cache du client.
+        """
+        snapshot = self.stats_warmer.snapshot
+        if snapshot is not None:
+            return rank_players(snapshot.players, ranking_type, limit), snapshot.taken_at
+        return rank_players(await self.api_client.get_players(), ranking_type, limit), None
+    
+    @staticmethod
+    def _format_period(hours: int) -> str:
+        """Formate une durée en heures pour l'affichage."""
+        if hours > 24 and hours % 24 == 0:
+            return f"{hours // 24} jours"
+        return f"{hours} h"
 
 async def setup(bot: commands.Bot):
     """Fonction de configuration du Cog."""
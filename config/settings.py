@@ -1,12 +1,73 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 import os
 
+@dataclass
+class PlanServer:
+    """Serveur Minecraft suivi : nom côté Plan et instance Plan qui l'expose."""
+    name: str = "Server 1"
+    base_url: Optional[str] = None  # None = APIConfig.minecraft_base_url
+
 @dataclass
 class APIConfig:
     """Configuration pour les APIs externes."""
     minecraft_base_url: str = "http://localhost:8804"
-    timeout: int = 30
+    timeout: int = 30  # durée totale max d'une requête (secondes)
+    connect_timeout: float = 5
+    max_concurrency: int = 10  # requêtes simultanées max vers l'API Plan
+    # Pool de connexions HTTP
+    pool_limit: int = 100
+    pool_limit_per_host: int = 20
+    keepalive_timeout: float = 30
+    dns_cache_ttl: int = 300
+    # Retries des requêtes GET et disjoncteur
+    max_retries: int = 2
+    retry_base_delay: float = 0.5
+    circuit_failure_threshold: int = 5  # échecs consécutifs avant ouverture
+    circuit_reset_timeout: float = 30  # secondes avant une requête d'essai
+    # Cache des réponses (secondes)
+    players_cache_ttl: float = 30
+    player_stats_cache_ttl: float = 60
+    cache_stale_ttl: float = 300
+    cache_max_size: int = 5000
+    # Rafraîchissement des statistiques en arrière-plan (secondes)
+    stats_refresh_interval: float = 300
+    stats_wait_timeout: float = 120  # attente max du premier instantané par une commande
+    # Serveurs du réseau (BungeeCord/Velocity) et délai max par serveur (secondes)
+    servers: List[PlanServer] = field(default_factory=lambda: [PlanServer()])
+    server_timeout: float = 10
+    
+    @classmethod
+    def from_env(cls) -> 'APIConfig':
+        """Crée une configuration à partir des variables d'environnement.
+        
+        `MINECRAFT_SERVERS` : liste séparée par des virgules de `nom` ou
+        `nom@url` (serveur exposé par une autre instance Plan).
+        """
+        servers = []
+        for entry in os.getenv('MINECRAFT_SERVERS', '').split(','):
+            name, _, base_url = entry.strip().partition('@')
+            if name:
+                servers.append(PlanServer(name.strip(), base_url.strip() or None))
+        return cls(
+            minecraft_base_url=os.getenv('MINECRAFT_API_URL', cls.minecraft_base_url),
+            servers=servers or [PlanServer()]
+        )
+    
+    def session_options(self) -> dict:
+        """Paramètres de `api.resilience.create_session`."""
+        return {
+            "timeout": self.timeout,
+            "connect_timeout": self.connect_timeout,
+            "limit": self.pool_limit,
+            "limit_per_host": self.pool_limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "dns_cache_ttl": self.dns_cache_ttl
+        }
+    
+    def plan_instances(self) -> List[str]:
+        """URLs des instances Plan distinctes, dans l'ordre de configuration."""
+        return list(dict.fromkeys(server.base_url or self.minecraft_base_url for server in self.servers))
 
 @dataclass
 class BotConfig:
@@ -25,6 +86,63 @@ class BotConfig:
             minecraft_killfeed_channel_id=int(os.getenv('MINECRAFT_KILLFEED_CHANNEL', 1389082181309300796))
         )
 
+@dataclass
+class KillFeedConfig:
+    """Configuration du polling du killfeed (secondes)."""
+    min_interval: float = 5
+    max_interval: float = 300
+    initial_interval: float = 30
+    backoff_factor: float = 1.5  # sans nouveau kill
+    error_factor: float = 3  # en cas d'erreur API
+    jitter: float = 0.1  # ±10 %
+    pipeline_queue_size: int = 100  # taille des files entre les étages du pipeline
+    # Workers des étages enrich et render (résultats remis dans l'ordre) ;
+    # fetch, dedupe, deliver et persist restent à un seul worker
+    enrich_workers: int = 1
+    render_workers: int = 1
+
+@dataclass
+class WebhookConfig:
+    """Configuration du webhook de réception des kills (push depuis le serveur Minecraft)."""
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 8805
+    path: str = "/kills"
+    secret: Optional[str] = None  # transmis dans l'en-tête X-Webhook-Token
+    max_batch: int = 500
+    # Polling de réconciliation quand le webhook est actif (secondes)
+    fallback_interval: float = 300
+    
+    @classmethod
+    def from_env(cls) -> 'WebhookConfig':
+        """Crée une configuration à partir des variables d'environnement."""
+        return cls(
+            enabled=os.getenv('MINECRAFT_WEBHOOK_ENABLED', '').lower() in ('1', 'true', 'yes'),
+            host=os.getenv('MINECRAFT_WEBHOOK_HOST', cls.host),
+            port=int(os.getenv('MINECRAFT_WEBHOOK_PORT', cls.port)),
+            secret=os.getenv('MINECRAFT_WEBHOOK_SECRET') or None
+        )
+
+@dataclass
+class StorageConfig:
+    """Configuration du stockage local (SQLite)."""
+    database_path: str = "data/minecraft_stats.db"
+    flush_interval: float = 2.0  # secondes entre deux écritures groupées
+    batch_size: int = 200
+    snapshot_interval: float = 3600  # secondes entre deux instantanés de stats
+    kill_cursor_path: str = "data/kill_cursor.json"  # point de reprise du killfeed
+    
+    @classmethod
+    def from_env(cls) -> 'StorageConfig':
+        """Crée une configuration à partir des variables d'environnement."""
+        return cls(
+            database_path=os.getenv('MINECRAFT_DB_PATH', cls.database_path),
+            kill_cursor_path=os.getenv('MINECRAFT_KILL_CURSOR_PATH', cls.kill_cursor_path)
+        )
+
 # Configuration globale
-api_config = APIConfig()
-bot_config = BotConfig.from_env() 
\ No newline at end of file
+api_config = APIConfig.from_env()
+bot_config = BotConfig.from_env()
+killfeed_config = KillFeedConfig()
+storage_config = StorageConfig.from_env()
+webhook_config = WebhookConfig.from_env() 
\ No newline at end of file
@@ -0,0 +1,124 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional
+from api.models import KillEvent
+
+logger = logging.getLogger(__name__)
+
+# Reçoit le kill et la charge utile publiée avec lui (ex. l'embed déjà rendu) ;
+# retourne False si le kill n'a pas été accepté (ex. file d'envoi pleine)
+KillCallback = Callable[[KillEvent, Any], Optional[bool]]
+
+@dataclass(frozen=True)
+class KillFilter:
+    """Filtre d'un abonné : joueurs (tueur ou victime), armes et distance minimale.
+    
+    Un critère vide laisse tout passer.
+    """
+    players: FrozenSet[str] = frozenset()
+    weapons: FrozenSet[str] = frozenset()
+    min_distance: float = 0.0
+    
+    @classmethod
+    def create(
+        cls,
+        players: Optional[Iterable[str]] = None,
+        weapons: Optional[Iterable[str]] = None,
+        min_distance: Optional[float] = None
+    ) -> "KillFilter":
+        """Construit un filtre insensible à la casse."""
+        return cls(
+            players=frozenset(p.strip().casefold() for p in players or () if p.strip()),
+            weapons=frozenset(w.strip().casefold() for w in weapons or () if w.strip()),
+            min_distance=min_distance or 0.0
+        )
+    
+    def matches(self, kill: KillEvent) -> bool:
+        if self.min_distance and kill.distance < self.min_distance:
+            return False
+        if self.players and kill.killer.casefold() not in self.players and kill.victim.casefold() not in self.players:
+            return False
+        if self.weapons:
+            weapon = kill.weapon.casefold()
+            # "sword" correspond à "Diamond Sword"
+            if not any(w in weapon for w in self.weapons):
+                return False
+        return True
+    
+    def describe(self) -> str:
+        """Description lisible du filtre."""
+        parts = []
+        if self.players:
+            parts.append("joueurs : " + ", ".join(sorted(self.players)))
+        if self.weapons:
+            parts.append("armes : " + ", ".join(sorted(self.weapons)))
+        if self.min_distance:
+            parts.append(f"distance ≥ {self.min_distance:g} m")
+        return " · ".join(parts) or "tous les kills"
+
+@dataclass
+class KillSubscription:
+    """Abonnement au bus (un canal Discord, par exemple)."""
+    key: Hashable
+    callback: KillCallback
+    kill_filter: KillFilter = field(default_factory=KillFilter)
+    guild_id: Optional[int] = None
+    delivered: int = 0
+
+class KillEventBus:
+    """Bus d'événements en mémoire : une seule ingestion, N abonnés filtrés.
+    
+    `publish` est synchrone et ne fait que filtrer et appeler les abonnés :
+    ajouter un abonné ne coûte aucune requête Plan supplémentaire. Les
+    callbacks ne doivent pas bloquer (ex. mise en file non bloquante).
+    """
+    
+    def __init__(self):
+        self._subscriptions: Dict[Hashable, KillSubscription] = {}
+    
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+    
+    def subscribe(
+        self,
+        key: Hashable,
+        callback: KillCallback,
+        kill_filter: Optional[KillFilter] = None,
+        guild_id: Optional[int] = None
+    ) -> KillSubscription:
+        """Abonne `callback` sous la clé `key` (remplace un abonnement existant)."""
+        subscription = KillSubscription(key, callback, kill_filter or KillFilter(), guild_id)
+        self._subscriptions[key] = subscription
+        return subscription
+    
+    def unsubscribe(self, key: Hashable) -> Optional[KillSubscription]:
+        """Retire l'abonnement `key` et le retourne (None s'il n'existait pas)."""
+        return self._subscriptions.pop(key, None)
+    
+    def get(self, key: Hashable) -> Optional[KillSubscription]:
+        return self._subscriptions.get(key)
+    
+    def subscriptions(self, guild_id: Optional[int] = None) -> List[KillSubscription]:
+        """Abonnements, éventuellement restreints à un serveur Discord."""
+        return [
+            subscription for subscription in self._subscriptions.values()
+            if guild_id is None or subscription.guild_id == guild_id
+        ]
+    
+    def publish(self, kill: KillEvent, payload: Any = None) -> int:
+        """Transmet le kill aux abonnés dont le filtre correspond ; retourne le nombre qui l'ont accepté."""
+        delivered = 0
+        # Copie : un callback peut (dés)abonner pendant la diffusion
+        for subscription in list(self._subscriptions.values()):
+            if not subscription.kill_filter.matches(kill):
+                continue
+            try:
+                accepted = subscription.callback(kill, payload)
+            except Exception as e:
+                logger.error(f"Erreur chez l'abonné {subscription.key} du killfeed: {e}")
+                continue
+            if accepted is False:
+                continue
+            subscription.delivered += 1
+            delivered += 1
+        return delivered
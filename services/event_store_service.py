@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from api.minecraft_client import MinecraftAPIClient
+from api.models import KillEvent
+from services.stats_warmer import StatsSnapshot
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kills (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    killer TEXT NOT NULL,
+    victim TEXT NOT NULL,
+    weapon TEXT NOT NULL,
+    distance REAL NOT NULL DEFAULT 0,
+    server TEXT NOT NULL DEFAULT '',
+    UNIQUE (server, timestamp, killer, victim, weapon)
+);
+CREATE INDEX IF NOT EXISTS idx_kills_timestamp ON kills (timestamp);
+CREATE INDEX IF NOT EXISTS idx_kills_killer ON kills (killer, timestamp);
+CREATE INDEX IF NOT EXISTS idx_kills_victim ON kills (victim, timestamp);
+
+CREATE TABLE IF NOT EXISTS stats_snapshots (
+    taken_at INTEGER NOT NULL,
+    player_uuid TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    kills INTEGER NOT NULL,
+    deaths INTEGER NOT NULL,
+    kills_7d INTEGER NOT NULL,
+    deaths_7d INTEGER NOT NULL,
+    mob_kills INTEGER NOT NULL,
+    PRIMARY KEY (taken_at, player_uuid)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_player ON stats_snapshots (player_uuid, taken_at);
+"""
+
+class EventStoreService:
+    """Stockage local SQLite des kills et des instantanés de statistiques.
+    
+    Toutes les requêtes SQL s'exécutent dans un thread dédié (une seule
+    connexion, mode WAL) pour ne jamais bloquer la boucle asyncio.
+    Les kills sont mis en tampon puis insérés par lots.
+    """
+    
+    def __init__(
+        self,
+        database_path: str = "data/minecraft_stats.db",
+        flush_interval: float = 2.0,
+        batch_size: int = 200,
+        snapshot_interval: float = 3600
+    ):
+        self.database_path = database_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.snapshot_interval = snapshot_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: List[KillEvent] = []
+        self._flush_lock = asyncio.Lock()
+        # Réveille la tâche d'écriture avant son délai quand un lot complet attend
+        self._flush_requested = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._last_snapshot: Optional[float] = None
+    
+    ### Cycle de vie ###
+    async def open(self):
+        """Ouvre la base et crée le schéma si besoin."""
+        if self._conn is not None:
+            return
+        await self._run(self._open_sync)
+        self._tasks.append(asyncio.create_task(self._flush_loop()))
+    
+    async def close(self):
+        """Vide le tampon puis ferme la base."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._snapshot_task:
+            # Laisser se terminer l'écriture d'un instantané en cours
+            await asyncio.gather(self._snapshot_task, return_exceptions=True)
+            self._snapshot_task = None
+        
+        if self._conn is not None:
+            await self.flush()
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+    
+    def _open_sync(self):
+        directory = os.path.dirname(self.database_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self._conn = conn
+    
+    async def _run(self, func: Callable, *args) -> Any:
+        """Exécute une fonction bloquante dans le thread de la base."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    ### Écriture ###
+    def add_kill(self, kill: KillEvent):
+        """Ajoute un kill au tampon d'écriture (non bloquant)."""
+        self._pending.append(kill)
+        if len(self._pending) >= self.batch_size:
+            self._flush_requested.set()
+    
+    async def flush(self) -> int:
+        """Écrit les kills en attente en une seule transaction."""
+        async with self._flush_lock:
+            if not self._pending or self._conn is None:
+                return 0
+            pending, self._pending = self._pending, []
+            return await self.add_kills(pending)
+    
+    async def add_kills(self, kills: Iterable[KillEvent]) -> int:
+        """Insère des kills par lot (les doublons sont ignorés). Retourne le nombre inséré."""
+        # Serveur vide quand un seul serveur est suivi (kills non étiquetés)
+        rows = [(k.timestamp, k.killer, k.victim, k.weapon, k.distance, k.server or "") for k in kills]
+        if not rows:
+            return 0
+        return await self._run(self._insert_kills_sync, rows)
+    
+    def _insert_kills_sync(self, rows: List[Tuple]) -> int:
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO kills (timestamp, killer, victim, weapon, distance, server) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return self._conn.total_changes - before
+    
+    def record_snapshot(self, snapshot: StatsSnapshot):
+        """Listener du `StatsWarmer` : enregistre au plus un instantané par `snapshot_interval`.
+        
+        Les statistiques viennent de l'instantané déjà chargé, sans nouvelle requête à Plan.
+        """
+        if self._conn is None or (self._snapshot_task and not self._snapshot_task.done()):
+            return
+        if self._last_snapshot is not None and snapshot.taken_at - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = snapshot.taken_at
+        self._snapshot_task = asyncio.create_task(self._save_snapshot(snapshot))
+    
+    async def _save_snapshot(self, snapshot: StatsSnapshot):
+        try:
+            count = await self.snapshot_stats(snapshot)
+            logger.info(f"Instantané des statistiques enregistré ({count} joueurs)")
+        except Exception as e:
+            logger.error(f"Erreur lors de l'instantané des statistiques: {e}")
+    
+    async def snapshot_stats(self, snapshot: StatsSnapshot) -> int:
+        """Enregistre les statistiques de tous les joueurs d'un instantané du `StatsWarmer`."""
+        taken_at = int(snapshot.taken_at * 1000)
+        
+        rows = []
+        for player in snapshot.players:
+            stats = snapshot.player_stats(player.player_uuid)
+            if not stats:
+                continue
+            kill_data = stats.kill_data
+            rows.append((
+                taken_at,
+                player.player_uuid,
+                player.player_name,
+                kill_data.player_kills_total,
+                kill_data.deaths_total,
+                kill_data.player_kills_7d,
+                kill_data.deaths_7d,
+                kill_data.mob_kills_total
+            ))
+        
+        await self._run(self._insert_snapshot_sync, rows)
+        return len(rows)
+    
+    def _insert_snapshot_sync(self, rows: List[Tuple]):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stats_snapshots "
+                "(taken_at, player_uuid, player_name, kills, deaths, kills_7d, deaths_7d, mob_kills) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    async def backfill_kills(
+        self,
+        api_client: MinecraftAPIClient,
+        server: str = "Server 1",
+        tag_server: bool = False
+    ) -> int:
+        """Charge tout l'historique `/v1/kills` disponible dans la base.
+        
+        `tag_server` étiquette les kills avec leur serveur, comme le killfeed
+        le fait quand plusieurs serveurs sont suivis.
+        """
+        kills = await api_client.get_kills(server)
+        if tag_server:
+            for kill in kills:
+                kill.server = server
+        inserted = await self.add_kills(kills)
+        logger.info(f"Backfill des kills : {inserted} nouveaux sur {len(kills)} récupérés")
+        return inserted
+    
+    async def backfill_servers(self, api_client: MinecraftAPIClient, servers: List[str]) -> int:
+        """Backfill de chaque serveur suivi ; kills étiquetés dès que plusieurs serveurs le sont (comme le killfeed)."""
+        inserted = 0
+        for server in servers:
+            inserted += await self.backfill_kills(api_client, server, tag_server=len(servers) > 1)
+        return inserted
+    
+    ### Lecture ###
+    async def get_kills(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        player: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[KillEvent]:
+        """Retourne l'historique des kills (du plus ancien au plus récent)."""
+        query = "SELECT killer, victim, weapon, timestamp, distance, NULLIF(server, '') FROM kills WHERE 1=1"
+        params: List[Any] = []
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND timestamp < ?"
+            params.append(until)
+        if player is not None:
+            query += " AND (killer = ? OR victim = ?)"
+            params.extend([player, player])
+        query += " ORDER BY timestamp"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        rows = await self._run(self._fetchall_sync, query, params)
+        return [KillEvent(*row) for row in rows]
+    
+    async def count_kills(self) -> int:
+        """Retourne le nombre de kills enregistrés."""
+        rows = await self._run(self._fetchall_sync, "SELECT COUNT(*) FROM kills", [])
+        return rows[0][0]
+    
+    def _fetchall_sync(self, query: str, params: List[Any]) -> List[Tuple]:
+        return self._conn.execute(query, params).fetchall()
+    
+    ### Tâches de fond ###
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Erreur lors de l'écriture des kills en base: {e}")
+
+async def _backfill_main():
+    """Point d'entrée : `python -m services.event_store_service`.
+    
+    Charge l'historique de tous les serveurs configurés, comme le bot au premier démarrage.
+    """
+    from api.network_client import NetworkAPIClient
+    from config.settings import api_config, storage_config
+    
+    instances = api_config.plan_instances()
+    if len(instances) == 1:
+        api_client = MinecraftAPIClient(instances[0])
+    else:
+        api_client = NetworkAPIClient(
+            {base_url: MinecraftAPIClient(base_url) for base_url in instances},
+            {server.name: server.base_url or api_config.minecraft_base_url for server in api_config.servers},
+            timeout=api_config.server_timeout
+        )
+    
+    store = EventStoreService(storage_config.database_path)
+    await store.open()
+    try:
+        async with api_client:
+            await store.backfill_servers(api_client, [server.name for server in api_config.servers])
+        print(f"{await store.count_kills()} kills en base.")
+    finally:
+        await store.close()
+
+if __name__ == "__main__":
+    asyncio.run(_backfill_main())
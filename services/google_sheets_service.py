@@ -1,7 +1,12 @@
 # services/google_sheets_service.py
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from typing import List, Tuple
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, List, Optional, Tuple
+
+# gspread et oauth2client sont importés à la première connexion (imports lourds)
 
 # Définir la portée des permissions
 SCOPE = [
@@ -10,18 +15,34 @@ SCOPE = [
 ]
 CREDS_FILE = "google_credentials.json"
 SHEET_NAME = "Minecraft_Stats" # Le nom de votre fichier Google Sheets
+RANKING_HEADER = ["Rang", "Joueur", "Kills", "Morts", "K/D Ratio"]
+# Statuts HTTP temporaires (quota dépassé, erreurs serveur) : l'écriture est retentée
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 class GoogleSheetsService:
     """Service pour interagir avec Google Sheets."""
 
     def __init__(self):
+        self._killfeed_header_checked = False
+        self._worksheets = {}
+        self._last_ranking_rows: Optional[List[list]] = None
+        self.client = None
+        self.sheet = None
+
+    def connect(self):
+        """Autorise le compte de service et ouvre le fichier (appel bloquant)."""
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+
+        started = time.perf_counter()
+        creds = None
         try:
             creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPE)
             self.client = gspread.authorize(creds)
             print("Autorisation gspread réussie.")
             
             self.sheet = self.client.open(SHEET_NAME)
-            print("Connexion à Google Sheets réussie.")
+            print(f"Connexion à Google Sheets réussie en {time.perf_counter() - started:.2f}s.")
         except FileNotFoundError as e:
             self.client = None
             self.sheet = None
@@ -35,57 +56,274 @@ class GoogleSheetsService:
             self.sheet = None
 
     def _get_worksheet(self, worksheet_name: str):
-        """Récupère ou crée une feuille de calcul (onglet)."""
+        """Récupère ou crée une feuille de calcul (onglet), mise en cache."""
+        import gspread
+
         if not self.sheet:
             return None
+        worksheet = self._worksheets.get(worksheet_name)
+        if worksheet is not None:
+            return worksheet
         try:
-            return self.sheet.worksheet(worksheet_name)
+            worksheet = self.sheet.worksheet(worksheet_name)
         except gspread.WorksheetNotFound:
-            return self.sheet.add_worksheet(title=worksheet_name, rows="100", cols="20")
+            worksheet = self.sheet.add_worksheet(title=worksheet_name, rows="100", cols="20")
+        self._worksheets[worksheet_name] = worksheet
+        return worksheet
 
-    def update_ranking(self, ranking_data: List[Tuple[str, int, int, float]]):
-        """Met à jour la feuille de classement avec de nouvelles données."""
+    def update_ranking(self, ranking_data: List[Tuple[str, int, int, float]]) -> bool:
+        """Met à jour la feuille de classement avec de nouvelles données.
+
+        Seules les lignes modifiées depuis la dernière écriture sont envoyées,
+        en un seul `batch_update`. Rien n'est écrit si le classement est inchangé.
+        """
         if not self.sheet:
             print("Google Sheets non connecté.")
-            return
-        print("Mise à jour du classement dans Google Sheets...")
+            return False
         worksheet = self._get_worksheet("Ranking")
         if not worksheet:
             print("Feuille de classement non trouvée.")
-            return
-        print("Feuille de classement trouvée.")
+            return False
+
+        rows = [RANKING_HEADER]
+        for i, (name, kills, deaths, _score) in enumerate(ranking_data, 1):
+            if deaths > 0:
+                kd_text = f"{kills / deaths:.2f}"
+            else:
+                kd_text = "∞" if kills > 0 else "0.00"
+            rows.append([i, name, kills, deaths, kd_text])
+
+        previous = self._last_ranking_rows
+        if previous == rows:
+            return True
 
-        worksheet.clear()
-        header = ["Rang", "Joueur", "Kills", "Morts", "K/D Ratio"]
-        rows_to_insert = [header]
+        if previous is None:
+            # Contenu actuel inconnu : repartir d'une feuille vide
+            worksheet.clear()
+            previous = []
 
-        for i, (name, kills, deaths, kd_ratio) in enumerate(ranking_data, 1):
-            kd_text = "∞" if kd_ratio == float('inf') else f"{kd_ratio:.2f}"
-            rows_to_insert.append([i, name, kills, deaths, kd_text])
-        
-        worksheet.append_rows(rows_to_insert, value_input_option='USER_ENTERED')
-        print("Feuille de classement mise à jour.")
+        if worksheet.row_count < len(rows):
+            worksheet.add_rows(len(rows) - worksheet.row_count)
+
+        updates = []
+        blank = [""] * len(RANKING_HEADER)
+        start = None
+        for index in range(max(len(rows), len(previous)) + 1):
+            new_row = rows[index] if index < len(rows) else blank
+            old_row = previous[index] if index < len(previous) else blank
+            changed = index < max(len(rows), len(previous)) and new_row != old_row
+            if changed and start is None:
+                start = index
+            elif not changed and start is not None:
+                values = [rows[i] if i < len(rows) else blank for i in range(start, index)]
+                updates.append({"range": f"A{start + 1}:E{index}", "values": values})
+                start = None
+
+        worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+        self._last_ranking_rows = rows
+        print(f"Feuille de classement mise à jour ({len(updates)} plage(s) modifiée(s)).")
+        return True
 
     def log_kill(self, kill_event):
         """Ajoute une ligne pour un nouvel événement de kill."""
-        if not self.sheet:
-            return
+        self.append_kills([kill_event])
+
+    def append_kills(self, kill_events: List) -> bool:
+        """Ajoute plusieurs événements de kill en un seul appel `append_rows`."""
+        if not self.sheet or not kill_events:
+            return False
 
         worksheet = self._get_worksheet("KillFeed")
         if not worksheet:
+            return False
+
+        rows = []
+        # Si la feuille est vide, ajouter un en-tête (vérifié une seule fois)
+        if not self._killfeed_header_checked:
+            if worksheet.row_count == 1 and worksheet.acell('A1').value is None:
+                rows.append(["Timestamp", "Tueur", "Victime", "Arme", "Distance"])
+            self._killfeed_header_checked = True
+
+        for kill_event in kill_events:
+            rows.append([
+                kill_event.timestamp,
+                kill_event.killer,
+                kill_event.victim,
+                kill_event.weapon,
+                f"{kill_event.distance:.2f}m"
+            ])
+        worksheet.append_rows(rows, value_input_option='USER_ENTERED')
+        print(f"{len(kill_events)} kill(s) enregistré(s) dans Google Sheets.")
+        return True
+
+class SheetsWriteBehindQueue:
+    """File d'écriture différée vers Google Sheets.
+
+    Les appels gspread (bloquants) sont exécutés dans un thread dédié.
+    Les kills en attente sont fusionnés en un seul `append_rows` par fenêtre
+    de flush, seul le dernier classement demandé est écrit. La mémoire est
+    bornée (`max_pending`), les erreurs de quota sont retentées avec backoff
+    et la file est vidée à l'arrêt.
+
+    Un lot en erreur temporaire (quota, 5xx, réseau) est remis en file, au
+    plus `max_retries` flushs de suite ; une erreur définitive l'abandonne.
+    Les kills abandonnés sont comptés dans `failed_kills`, ceux perdus
+    faute de place dans `dropped_kills`.
+    """
+
+    def __init__(
+        self,
+        sheets_service: Optional[GoogleSheetsService] = None,
+        flush_interval: float = 5.0,
+        max_pending: int = 5000,
+        max_retries: int = 5
+    ):
+        self.sheets_service = sheets_service
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.dropped_kills = 0
+        self.failed_kills = 0
+        self._failed_flushes = 0
+        self._kills: Deque = deque(maxlen=max_pending)
+        self._ranking: Optional[List[Tuple[str, int, int, float]]] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheets-writer")
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Nombre de kills en attente d'écriture."""
+        return len(self._kills)
+
+    def start(self):
+        """Démarre la tâche de flush périodique."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Arrête la tâche périodique et écrit ce qui reste en attente."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._executor.shutdown(wait=False)
+
+    def log_kill(self, kill_event):
+        """Met un kill en file (non bloquant). Au-delà de la borne, le plus ancien est perdu."""
+        if len(self._kills) == self._kills.maxlen:
+            self.dropped_kills += 1
+        self._kills.append(kill_event)
+
+    def update_ranking(self, ranking_data: List[Tuple[str, int, int, float]]):
+        """Programme l'écriture du classement (seul le plus récent est conservé)."""
+        self._ranking = list(ranking_data)
+
+    async def flush(self):
+        """Écrit immédiatement les données en attente."""
+        async with self._flush_lock:
+            if not self._kills and self._ranking is None:
+                return
+            if self.sheets_service is None:
+                self.sheets_service = await get_sheets_service()
+            
+            if self._kills:
+                kills = list(self._kills)
+                self._kills.clear()
+                written = False
+                try:
+                    written = await self._write(self.sheets_service.append_kills, kills)
+                finally:
+                    self._settle_kills(kills, written)
+
+            if self._ranking is not None:
+                ranking, self._ranking = self._ranking, None
+                written = False
+                try:
+                    written = await self._write(self.sheets_service.update_ranking, ranking)
+                finally:
+                    # Erreur définitive : abandonné ; un classement plus récent remplace celui-ci
+                    if written is False and self._ranking is None:
+                        self._ranking = ranking
+
+    def _settle_kills(self, kills: list, written: Optional[bool]):
+        """Remet en tête de file un lot non écrit, ou l'abandonne (erreur définitive, trop d'échecs)."""
+        if written:
+            self._failed_flushes = 0
+            return
+        if written is False:
+            self._failed_flushes += 1
+        if written is None or self._failed_flushes > self.max_retries:
+            print(f"Google Sheets : {len(kills)} kill(s) abandonné(s) après erreur")
+            self.failed_kills += len(kills)
+            self._failed_flushes = 0
             return
 
-        # Si la feuille est vide, ajouter un en-tête
-        if worksheet.row_count == 1 and worksheet.acell('A1').value is None:
-             header = ["Timestamp", "Tueur", "Victime", "Arme", "Distance"]
-             worksheet.append_row(header, value_input_option='USER_ENTERED')
-
-        row = [
-            kill_event.timestamp,
-            kill_event.killer,
-            kill_event.victim,
-            kill_event.weapon,
-            f"{kill_event.distance:.2f}m"
-        ]
-        worksheet.append_row(row, value_input_option='USER_ENTERED')
-        print(f"Kill de {kill_event.killer} sur {kill_event.victim} enregistré.")
\ No newline at end of file
+        # Remettre en tête de file pour le prochain flush ; sans place, les plus anciens sont perdus
+        overflow = len(kills) + len(self._kills) - self._kills.maxlen
+        if overflow > 0:
+            self.dropped_kills += overflow
+            kills = kills[overflow:]
+        self._kills.extendleft(reversed(kills))
+
+    async def _write(self, func, data) -> Optional[bool]:
+        """Exécute une écriture gspread dans le thread dédié, avec retries sur quota.
+
+        Retourne True si écrit, False après une erreur temporaire (à retenter
+        au prochain flush), None après une erreur définitive.
+        """
+        import gspread
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            try:
+                await loop.run_in_executor(self._executor, func, data)
+                return True
+            except gspread.exceptions.APIError as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if status not in RETRY_STATUSES:
+                    print(f"Erreur Google Sheets ({status}): {e}")
+                    return None
+                if attempt == self.max_retries:
+                    print(f"Erreur Google Sheets ({status}), nouvel essai au prochain flush: {e}")
+                    return False
+                delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+                print(f"Quota Google Sheets atteint, nouvel essai dans {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except OSError as e:
+                # Erreur réseau (requests.ConnectionError, délai dépassé) : temporaire
+                print(f"Erreur réseau Google Sheets, nouvel essai au prochain flush: {type(e).__name__} - {e}")
+                return False
+            except Exception as e:
+                print(f"Erreur lors de l'écriture dans Google Sheets: {type(e).__name__} - {e}")
+                return None
+        return False
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+# Service partagé par tout le processus, connecté à la première utilisation
+_shared_service: Optional[GoogleSheetsService] = None
+_shared_lock: Optional[asyncio.Lock] = None
+
+async def get_sheets_service() -> GoogleSheetsService:
+    """Retourne le service Google Sheets partagé, en le connectant au premier appel.
+
+    La connexion (OAuth + ouverture du fichier) s'exécute hors de la boucle asyncio.
+    """
+    global _shared_service, _shared_lock
+    if _shared_service is not None:
+        return _shared_service
+    if _shared_lock is None:
+        _shared_lock = asyncio.Lock()
+    async with _shared_lock:
+        if _shared_service is None:
+            service = GoogleSheetsService()
+            await asyncio.get_running_loop().run_in_executor(None, service.connect)
+            _shared_service = service
+    return _shared_service
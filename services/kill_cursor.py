@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from api.models import KillEvent
+
+logger = logging.getLogger(__name__)
+
+EventKey = Tuple[int, str, str, str]
+
+def event_key(kill: KillEvent) -> EventKey:
+    """Identifiant d'un kill (deux kills peuvent partager la même milliseconde)."""
+    return (kill.timestamp, kill.killer, kill.victim, kill.weapon)
+
+class KillCursor:
+    """Curseur d'ingestion des kills : timestamp + clés récemment vues.
+    
+    Un kill est nouveau s'il n'est pas plus ancien que le curseur et que sa
+    clé n'a pas déjà été vue. L'ensemble des clés est borné (`max_keys`).
+    Le curseur peut être sauvegardé sur disque pour survivre aux redémarrages.
+    
+    Un kill sélectionné mais pas encore traité est « réservé » (`reserve`) :
+    il n'est plus sélectionné, mais le point de reprise sauvegardé ne le
+    dépasse qu'une fois le kill confirmé (`advance`). Un kill dont le
+    traitement échoue est rendu (`release`) et sera sélectionné à nouveau ;
+    un arrêt rejoue de même les kills réservés au lieu de les perdre.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_keys: int = 1000):
+        self.path = path
+        self.timestamp = 0
+        self._recent: Deque[EventKey] = deque(maxlen=max_keys)
+        self._recent_keys: Set[EventKey] = set()
+        # Kills réservés, pas encore confirmés : clé → timestamp
+        self._pending: Dict[EventKey, int] = {}
+        self._dirty = False
+    
+    def is_new(self, kill: KillEvent) -> bool:
+        """Indique si le kill n'a pas encore été ingéré."""
+        key = event_key(kill)
+        return kill.timestamp >= self.timestamp and key not in self._recent_keys and key not in self._pending
+    
+    def reserve(self, kill: KillEvent):
+        """Marque un kill comme sélectionné (en cours de traitement), sans avancer le point de reprise."""
+        key = event_key(kill)
+        if key in self._recent_keys:
+            return
+        self._pending[key] = kill.timestamp
+        self.timestamp = max(self.timestamp, kill.timestamp)
+    
+    def release(self, kill: KillEvent):
+        """Annule la réservation d'un kill (traitement en échec) : il redevient nouveau."""
+        if self._pending.pop(event_key(kill), None) is None:
+            return
+        self.timestamp = min(self.timestamp, kill.timestamp)
+    
+    def release_all(self):
+        """Annule toutes les réservations : le curseur revient au point de reprise."""
+        self.timestamp = self.checkpoint
+        self._pending.clear()
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    @property
+    def checkpoint(self) -> int:
+        """Timestamp sauvegardé : jamais au-delà d'un kill réservé non confirmé."""
+        if self._pending:
+            return min(self.timestamp, min(self._pending.values()))
+        return self.timestamp
+    
+    def advance(self, kill: KillEvent):
+        """Marque un kill comme ingéré (confirmé)."""
+        key = event_key(kill)
+        reserved = self._pending.pop(key, None) is not None
+        if key in self._recent_keys:
+            return
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_keys.discard(self._recent[0])
+        self._recent.append(key)
+        self._recent_keys.add(key)
+        if not reserved:
+            # Un kill réservé a déjà avancé le curseur (qu'un `release` a pu ramener en arrière)
+            self.timestamp = max(self.timestamp, kill.timestamp)
+        self._dirty = True
+    
+    def select_new(self, kills: List[KillEvent]) -> List[KillEvent]:
+        """Retourne les kills nouveaux, du plus ancien au plus récent.
+        
+        Si la liste est triée (Plan renvoie les kills les plus récents en
+        premier), le parcours s'arrête au premier kill antérieur au curseur.
+        """
+        if not kills:
+            return []
+        
+        if kills[0].timestamp >= kills[-1].timestamp:
+            ordered: Iterable[KillEvent] = kills
+        else:
+            ordered = reversed(kills)
+        
+        new_kills = []
+        for kill in ordered:
+            if kill.timestamp < self.timestamp:
+                break
+            if self.is_new(kill):
+                new_kills.append(kill)
+        
+        # Garantir l'ordre chronologique même si la liste n'était pas triée
+        new_kills.sort(key=lambda kill: kill.timestamp)
+        return new_kills
+    
+    ### Persistance ###
+    def load(self) -> bool:
+        """Recharge le curseur depuis le disque. Retourne False si aucun point de reprise."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Point de reprise du killfeed illisible ({self.path}): {e}")
+            return False
+        
+        self.timestamp = int(data.get("timestamp", 0))
+        self._recent.clear()
+        self._recent_keys.clear()
+        self._pending.clear()
+        for key in data.get("recent", []):
+            key = tuple(key)
+            self._recent.append(key)
+            self._recent_keys.add(key)
+        self._dirty = False
+        return True
+    
+    def save(self, force: bool = False):
+        """Enregistre le curseur sur disque (écriture atomique), s'il a changé."""
+        if not self.path or not (self._dirty or force):
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": self.checkpoint, "recent": list(self._recent)}, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
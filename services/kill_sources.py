@@ -0,0 +1,85 @@
+import asyncio
+import heapq
+import time
+from typing import List, Optional
+from api.models import KillEvent, ServerHealth
+from services.kill_cursor import KillCursor
+
+class KillSource:
+    """Flux de kills d'un serveur : curseur d'ingestion et état de santé propres.
+    
+    `api_client` est un `MinecraftAPIClient` ou un `NetworkAPIClient` (qui
+    route la requête vers l'instance Plan exposant le serveur).
+    """
+    
+    def __init__(
+        self,
+        server: str,
+        api_client,
+        cursor: Optional[KillCursor] = None,
+        timeout: float = 10,
+        save_interval: float = 1
+    ):
+        self.server = server
+        self.api_client = api_client
+        self.timeout = timeout
+        self.health = ServerHealth(server)
+        # Curseur d'ingestion : timestamp + clés récentes, sauvegardé sur disque
+        self.cursor = cursor if cursor is not None else KillCursor()
+        self.cursor_ready = self.cursor.load()
+        # Support du paramètre `since` par Plan (None = pas encore déterminé)
+        self._since_supported: Optional[bool] = None
+        self.save_interval = save_interval
+        self._saved_at = 0.0
+    
+    async def fetch(self) -> List[KillEvent]:
+        """Télécharge les kills (dans la limite de `timeout`), en transmettant le curseur si Plan le supporte."""
+        since = self.cursor.timestamp if self.cursor_ready and self._since_supported is not False else None
+        started = time.perf_counter()
+        try:
+            kills = await asyncio.wait_for(self.api_client.get_kills(self.server, since=since), self.timeout)
+        except Exception as e:
+            self.health.record_error(f"{type(e).__name__}: {e}", time.perf_counter() - started)
+            raise
+        self.health.record_success(time.perf_counter() - started)
+        
+        if since is not None and kills and self._since_supported is None:
+            # Si Plan renvoie des kills antérieurs à `since`, le paramètre est ignoré
+            self._since_supported = all(kill.timestamp >= since for kill in kills)
+        return kills
+    
+    def select_new(self, kills: List[KillEvent]) -> List[KillEvent]:
+        """Retourne les kills non encore ingérés (ordre chronologique) et les réserve.
+        
+        Le point de reprise n'avance qu'avec `commit`, une fois le kill traité.
+        """
+        if not self.cursor_ready:
+            # Premier démarrage sans point de reprise : ne pas rejouer l'historique
+            for kill in kills:
+                self.cursor.advance(kill)
+            self.cursor_ready = True
+            self.cursor.save(force=True)
+            return []
+        
+        new_kills = self.cursor.select_new(kills)
+        for kill in new_kills:
+            self.cursor.reserve(kill)
+        return new_kills
+    
+    def commit(self, kill: KillEvent):
+        """Confirme un kill entièrement traité (envoyé et enregistré) et sauvegarde le point de reprise.
+        
+        La sauvegarde est limitée à une par `save_interval` secondes ; `flush` force l'écriture.
+        """
+        self.cursor.advance(kill)
+        now = time.monotonic()
+        if now - self._saved_at >= self.save_interval:
+            self.flush()
+    
+    def flush(self):
+        self.cursor.save()
+        self._saved_at = time.monotonic()
+
+def merge_by_timestamp(streams: List[List[KillEvent]]) -> List[KillEvent]:
+    """Fusionne des listes de kills déjà chronologiques en une seule."""
+    return list(heapq.merge(*streams, key=lambda kill: kill.timestamp))
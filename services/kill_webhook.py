@@ -0,0 +1,172 @@
+import asyncio
+import hmac
+import logging
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+from aiohttp import web
+from api.models import KillEvent
+
+logger = logging.getLogger(__name__)
+
+# En-tête portant le secret partagé avec le plugin/script émetteur
+TOKEN_HEADER = "X-Webhook-Token"
+
+# Avance tolérée sur l'horloge locale (ms) : au-delà, le kill est rejeté
+# (un timestamp futur ferait ignorer tous les kills suivants par le curseur)
+MAX_CLOCK_SKEW_MS = 5 * 60 * 1000
+
+# Reçoit les kills validés et retourne le nombre de kills acceptés (None = killfeed inactif)
+KillHandler = Callable[[List[KillEvent]], Awaitable[Optional[int]]]
+
+def parse_kill_event(data: Any) -> KillEvent:
+    """Valide un kill reçu (même format que `/v1/kills` de Plan).
+    
+    Lève ValueError si un champ est absent ou invalide.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("un kill doit être un objet JSON")
+    
+    fields = {}
+    for name in ("killer", "victim", "weapon"):
+        value = data.get(name)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"champ '{name}' manquant ou vide")
+        fields[name] = value.strip()
+    
+    timestamp = data.get("timestamp")
+    if isinstance(timestamp, bool) or not isinstance(timestamp, int) or timestamp <= 0:
+        raise ValueError("champ 'timestamp' invalide (millisecondes epoch attendues)")
+    if timestamp > time.time() * 1000 + MAX_CLOCK_SKEW_MS:
+        raise ValueError("champ 'timestamp' dans le futur")
+    
+    distance = data.get("distance", 0.0)
+    if isinstance(distance, bool) or not isinstance(distance, (int, float)) or distance < 0:
+        raise ValueError("champ 'distance' invalide")
+    
+    server = data.get("server")
+    if server is not None and not isinstance(server, str):
+        raise ValueError("champ 'server' invalide")
+    
+    return KillEvent(timestamp=timestamp, distance=float(distance), server=server, **fields)
+
+def parse_kill_payload(payload: Any) -> List[KillEvent]:
+    """Accepte un kill, une liste de kills ou `{"kills": [...]}`."""
+    if isinstance(payload, dict) and "kills" in payload:
+        payload = payload["kills"]
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        raise ValueError("un kill, une liste de kills ou {\"kills\": [...]} est attendu")
+    
+    kills = []
+    for index, data in enumerate(payload):
+        try:
+            kills.append(parse_kill_event(data))
+        except ValueError as e:
+            raise ValueError(f"kill #{index}: {e}") from None
+    return kills
+
+class KillWebhookServer:
+    """Point d'entrée HTTP local recevant les kills poussés par le serveur Minecraft.
+    
+    `POST <path>` avec un kill, une liste de kills ou `{"kills": [...]}` en JSON.
+    Si un secret est configuré, il doit être transmis dans l'en-tête `X-Webhook-Token`.
+    """
+    
+    def __init__(
+        self,
+        handler: KillHandler,
+        host: str = "127.0.0.1",
+        port: int = 8805,
+        path: str = "/kills",
+        secret: Optional[str] = None,
+        max_batch: int = 500
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.max_batch = max_batch
+        self.received_kills = 0
+        self.rejected_requests = 0
+        self.last_received_at: Optional[float] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    async def start(self):
+        """Démarre le serveur HTTP."""
+        if self._runner is not None:
+            return
+        app = web.Application(client_max_size=1024 * 1024)
+        app.router.add_post(self.path, self._handle_kills)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Webhook killfeed à l'écoute sur http://{self.host}:{self.port}{self.path}")
+    
+    async def stop(self):
+        """Arrête le serveur HTTP."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    async def _handle_kills(self, request: web.Request) -> web.Response:
+        if self.secret and not hmac.compare_digest(request.headers.get(TOKEN_HEADER, ""), self.secret):
+            self.rejected_requests += 1
+            return web.json_response({"error": "jeton invalide"}, status=401)
+        
+        try:
+            payload = await request.json()
+        except ValueError:
+            self.rejected_requests += 1
+            return web.json_response({"error": "JSON invalide"}, status=400)
+        try:
+            kills = parse_kill_payload(payload)
+        except ValueError as e:
+            self.rejected_requests += 1
+            return web.json_response({"error": str(e)}, status=400)
+        if len(kills) > self.max_batch:
+            self.rejected_requests += 1
+            return web.json_response({"error": f"maximum {self.max_batch} kills par requête"}, status=413)
+        
+        accepted = await self.handler(kills)
+        if accepted is None:
+            return web.json_response({"error": "killfeed inactif"}, status=503)
+        
+        self.received_kills += len(kills)
+        self.last_received_at = time.time()
+        return web.json_response({"received": len(kills), "accepted": accepted})
+
+async def _send_fake_kills():
+    """Point d'entrée de test : `python -m services.kill_webhook [nombre] [intervalle]`.
+    
+    Envoie de faux kills au webhook local configuré.
+    """
+    import random
+    import sys
+    import aiohttp
+    from config.settings import webhook_config
+    
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    players = ["Steve", "Alex", "Notch", "Herobrine", "Jeb"]
+    weapons = ["Diamond Sword", "Bow", "Netherite Axe", "Trident"]
+    url = f"http://{webhook_config.host}:{webhook_config.port}{webhook_config.path}"
+    headers = {TOKEN_HEADER: webhook_config.secret} if webhook_config.secret else {}
+    
+    async with aiohttp.ClientSession(headers=headers) as session:
+        for _ in range(count):
+            killer, victim = random.sample(players, 2)
+            kill = {
+                "killer": killer,
+                "victim": victim,
+                "weapon": random.choice(weapons),
+                "distance": round(random.uniform(1, 60), 2),
+                "timestamp": int(time.time() * 1000)
+            }
+            async with session.post(url, json=kill) as response:
+                print(f"{killer} → {victim}: {response.status} {await response.text()}")
+            await asyncio.sleep(interval)
+
+if __name__ == "__main__":
+    asyncio.run(_send_fake_kills())
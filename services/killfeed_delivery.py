@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+import discord
+from api.models import KillEvent
+from views.minecraft_views import MinecraftViews
+
+logger = logging.getLogger(__name__)
+
+# Limites Discord
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_SUMMARY_LINES = 25
+
+class RateLimitBucket:
+    """Seau de jetons reproduisant une limite Discord (ex. 5 messages / 5 s par canal)."""
+    
+    def __init__(self, capacity: int = 5, period: float = 5.0):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.waits = 0
+    
+    async def acquire(self):
+        """Attend qu'un jeton soit disponible puis le consomme."""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                self.waits += 1
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.capacity / self.period)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            self.waits += 1
+            await asyncio.sleep((1 - self.tokens) * self.period / self.capacity)
+    
+    def block(self, retry_after: float):
+        """Bloque le seau après un 429 renvoyé par Discord."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        self.tokens = 0
+
+class KillFeedDeliveryQueue:
+    """File d'envoi des kills vers un canal Discord.
+    
+    Les kills sont regroupés : jusqu'à 10 embeds par message, ou un embed
+    compact multi-lignes quand le retard s'accumule. Le seau de rate limit
+    du canal est respecté. La file est bornée (`max_pending`) : quand elle
+    est pleine, `offer` abandonne le kill et le compte dans `dropped_kills`,
+    pour qu'un canal lent ne retarde ni le pipeline ni les autres canaux.
+    """
+    
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        max_pending: int = 500,
+        linger: float = 0.5,
+        compact_threshold: int = 30,
+        bucket: Optional[RateLimitBucket] = None
+    ):
+        self.channel = channel
+        self.linger = linger
+        self.compact_threshold = compact_threshold
+        self.bucket = bucket if bucket is not None else RateLimitBucket()
+        self.sent_messages = 0
+        self.sent_kills = 0
+        self.failed_kills = 0
+        self.dropped_kills = 0
+        self._queue: "asyncio.Queue[Tuple[KillEvent, Optional[discord.Embed]]]" = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def pending(self) -> int:
+        """Nombre de kills en attente d'envoi."""
+        return self._queue.qsize()
+    
+    def start(self):
+        """Démarre la tâche d'envoi."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._deliver_loop())
+    
+    async def stop(self, timeout: float = 10):
+        """Envoie ce qui reste (dans la limite de `timeout`) puis arrête la tâche."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Killfeed arrêté avec {self.pending} kills non envoyés")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    def offer(self, kill: KillEvent, embed: Optional[discord.Embed] = None) -> bool:
+        """Ajoute un kill (et son embed déjà rendu) sans attendre ; s'il n'y a plus de place, le kill est abandonné.
+        
+        Utilisé par le bus du killfeed : un canal lent ne doit pas ralentir les autres.
+        """
+        try:
+            self._queue.put_nowait((kill, embed))
+        except asyncio.QueueFull:
+            self.dropped_kills += 1
+            return False
+        return True
+    
+    async def _deliver_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Laisser une rafale s'accumuler pour la regrouper
+            if self.linger and self._queue.empty():
+                await asyncio.sleep(self.linger)
+            
+            compact = self._queue.qsize() + 1 >= self.compact_threshold
+            max_batch = MAX_SUMMARY_LINES if compact else MAX_EMBEDS_PER_MESSAGE
+            while len(batch) < max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                await self._send(batch, compact)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_kills += len(batch)
+                logger.error(f"Erreur lors de l'envoi de {len(batch)} kill(s) dans le killfeed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _send(self, batch: List[Tuple[KillEvent, Optional[discord.Embed]]], compact: bool):
+        if compact:
+            embeds = [MinecraftViews.create_killfeed_summary_embed([kill for kill, _ in batch])]
+        else:
+            embeds = [embed or MinecraftViews.create_killfeed_embed(kill) for kill, embed in batch]
+        
+        for attempt in range(3):
+            await self.bucket.acquire()
+            try:
+                await self.channel.send(embeds=embeds)
+                break
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == 2:
+                    raise
+                retry_after = float(getattr(e, "retry_after", None) or self.bucket.period)
+                self.bucket.block(retry_after)
+        
+        self.sent_messages += 1
+        self.sent_kills += len(batch)
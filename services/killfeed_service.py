@@ -1,79 +1,299 @@
 import asyncio
+import logging
+import time
 import discord
-from datetime import datetime
-from api.minecraft_client import MinecraftAPIClient, KillEvent
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from api.models import KillEvent
+from services.event_bus import KillEventBus, KillFilter
+from services.killfeed_delivery import KillFeedDeliveryQueue
+from services.google_sheets_service import SheetsWriteBehindQueue
+from services.kill_sources import KillSource, merge_by_timestamp
+from services.pipeline import Pipeline, PipelineStage
+from services.poll_scheduler import AdaptivePollScheduler
 from views.minecraft_views import MinecraftViews
-from services.google_sheets_service import GoogleSheetsService
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class KillFeedItem:
+    """Kill en transit dans le pipeline du killfeed."""
+    kill: KillEvent
+    detected_at: float
+    source: Optional[KillSource] = None
+    embed: Optional[discord.Embed] = None
+    
+    def release(self):
+        """Rend le kill au curseur de son serveur (étage en échec) : il sera retenté."""
+        if self.source is not None:
+            self.source.cursor.release(self.kill)
 
 class KillFeedService:
-    """Service de monitoring du killfeed."""
+    """Service de monitoring du killfeed.
+    
+    Pipeline à étages indépendants reliés par des files bornées :
+    fetch → dedupe → enrich → render → deliver → persist.
+    Un étage lent ne provoque que de la backpressure sur les précédents.
+    
+    Une seule ingestion alimente un bus d'événements auquel s'abonnent
+    autant de canaux que nécessaire, chacun avec ses filtres et sa propre
+    file d'envoi.
+    """
     
-    def __init__(self, api_client: MinecraftAPIClient, channel: discord.TextChannel = None):
-        self.api_client = api_client
-        self.channel = channel
+    def __init__(
+        self,
+        sources: List[KillSource],
+        sheets_writer: Optional[SheetsWriteBehindQueue] = None,
+        scheduler: Optional[AdaptivePollScheduler] = None,
+        queue_size: int = 100,
+        bus: Optional[KillEventBus] = None,
+        workers: Optional[Dict[str, int]] = None
+    ):
+        # Un flux par serveur du réseau, chacun avec son curseur et son état de santé
+        self.sources = sources
+        self.bus = bus if bus is not None else KillEventBus()
         self.is_monitoring = False
         self.monitoring_task = None
-        self.last_kill_timestamp = 0
-        self.check_interval = 30  # secondes
-        self.sheets_service = GoogleSheetsService()
+        # Intervalle de polling adaptatif (resserré pendant les combats)
+        self.scheduler = scheduler if scheduler is not None else AdaptivePollScheduler()
+        self.sheets_writer = sheets_writer
+        self.queue_size = queue_size
+        # Workers des étages enrich et render (1 par défaut, résultats remis dans l'ordre) ;
+        # les autres restent séquentiels : curseur (fetch, dedupe), ordre de publication (deliver, persist)
+        self.workers = workers or {}
+        self._kill_listeners: List[Callable[[KillEvent], None]] = []
+        self._kill_sinks: List[Callable[[KillEvent], None]] = []
+        # File d'envoi par canal abonné (rate limit Discord propre à chaque canal)
+        self.deliveries: Dict[int, KillFeedDeliveryQueue] = {}
+        self.pipeline: Optional[Pipeline] = None
+    
+    def add_kill_listener(self, listener: Callable[[KillEvent], None]):
+        """Enregistre une fonction appelée pour chaque nouveau kill détecté (étage enrich)."""
+        self._kill_listeners.append(listener)
+    
+    def add_kill_sink(self, sink: Callable[[KillEvent], None]):
+        """Enregistre une fonction de persistance appelée après l'envoi (étage persist)."""
+        self._kill_sinks.append(sink)
     
 
     
+    ### Abonnements ###
+    async def subscribe_channel(
+        self,
+        channel: discord.abc.Messageable,
+        kill_filter: Optional[KillFilter] = None
+    ) -> Tuple[bool, str]:
+        """Abonne un canal au killfeed (ou met à jour ses filtres) et démarre l'ingestion si besoin."""
+        guild = getattr(channel, "guild", None)
+        updated = channel.id in self.deliveries
+        if not updated:
+            delivery = KillFeedDeliveryQueue(channel)
+            delivery.start()
+            self.deliveries[channel.id] = delivery
+        subscription = self.bus.subscribe(
+            channel.id,
+            self.deliveries[channel.id].offer,
+            kill_filter,
+            guild.id if guild else None
+        )
+        
+        if not self.is_monitoring:
+            await self.start_monitoring()
+        verb = "mis à jour" if updated else "démarré"
+        return True, f"Killfeed {verb} dans {channel.mention} ({subscription.kill_filter.describe()})"
+    
+    async def unsubscribe_channel(self, channel: discord.abc.Messageable) -> Tuple[bool, str]:
+        """Désabonne un canal ; l'ingestion s'arrête avec le dernier abonné."""
+        if self.bus.unsubscribe(channel.id) is None:
+            return False, f"Le killfeed n'est pas actif dans {channel.mention}."
+        delivery = self.deliveries.pop(channel.id, None)
+        if delivery:
+            await delivery.stop()
+        if len(self.bus) == 0 and self.is_monitoring:
+            await self.stop_monitoring()
+        return True, f"Killfeed arrêté dans {channel.mention}"
+    
+    def dropped_kills(self, channel_id: int) -> int:
+        """Kills perdus par la file d'envoi du canal (pleine)."""
+        delivery = self.deliveries.get(channel_id)
+        return delivery.dropped_kills if delivery else 0
+    
     ### Start/Stop Monitoring ###
-    async def start_monitoring(self):
-        """Démarre le monitoring du killfeed."""
+    async def start_monitoring(self) -> bool:
+        """Démarre l'ingestion (une seule, quel que soit le nombre d'abonnés)."""
         if self.is_monitoring:
-            return False, "Le killfeed est déjà en cours de monitoring."
-        
-        if not self.channel:
-            return False, "Canal de killfeed non configuré."
+            return False
         
         self.is_monitoring = True
+        self.pipeline = self._build_pipeline()
+        self.pipeline.start()
         self.monitoring_task = asyncio.create_task(self._monitor_kills())
-        return True, f"Killfeed démarré dans {self.channel.mention}"
+        return True
     
-    async def stop_monitoring(self):
-        """Arrête le monitoring du killfeed."""
+    async def stop_monitoring(self) -> bool:
+        """Arrête l'ingestion puis vide les files d'envoi de tous les canaux."""
         if not self.is_monitoring:
-            return False, "Le killfeed n'est pas en cours de monitoring."
+            return False
         
         self.is_monitoring = False
         if self.monitoring_task:
             self.monitoring_task.cancel()
             self.monitoring_task = None
+        if self.pipeline:
+            await self.pipeline.stop()
+            self.pipeline = None
+        # Point de reprise des kills confirmés ; les kills encore réservés seront rejoués
+        for source in self.sources:
+            source.cursor.release_all()
+            source.flush()
+        for delivery in self.deliveries.values():
+            await delivery.stop()
+        self.deliveries.clear()
+        for subscription in self.bus.subscriptions():
+            self.bus.unsubscribe(subscription.key)
+        return True
+    
+    ### Ingestion ###
+    def source(self, server: Optional[str]) -> KillSource:
+        """Flux du serveur `server` (le premier si inconnu ou non précisé)."""
+        for source in self.sources:
+            if source.server == server:
+                return source
+        return self.sources[0]
+    
+    async def ingest(self, kills: List[KillEvent]) -> Optional[int]:
+        """Injecte des kills poussés (webhook) directement dans l'étage dedupe.
+        
+        Retourne le nombre de kills nouveaux, ou None si le killfeed est arrêté.
+        Le polling reste actif et rattrape les kills qui n'auraient pas été poussés.
+        """
+        if not self.is_monitoring or self.pipeline is None:
+            return None
+        
+        by_source: Dict[KillSource, List[KillEvent]] = {}
+        for kill in kills:
+            by_source.setdefault(self.source(kill.server), []).append(kill)
         
-        channel_name = self.channel.mention if self.channel else "le canal"
-        return True, f"Killfeed arrêté dans {channel_name}"
+        fetched = []
+        for source, source_kills in by_source.items():
+            # Des kills en direct : pas d'historique à ignorer au premier démarrage
+            source.cursor_ready = True
+            new_kills = source.cursor.select_new(source_kills)
+            if new_kills:
+                fetched.append((source, new_kills))
+        if fetched:
+            await self.pipeline.stage("dedupe").queue.put((fetched, None))
+        return sum(len(new_kills) for _, new_kills in fetched)
+    
+    ### Pipeline ###
+    def _build_pipeline(self) -> Pipeline:
+        def workers(name: str) -> int:
+            return max(1, self.workers.get(name, 1))
+        
+        return Pipeline([
+            PipelineStage("fetch", self._stage_fetch, max_queue=1),
+            PipelineStage("dedupe", self._stage_dedupe, max_queue=self.queue_size),
+            # Résultats transmis dans l'ordre : deliver publie les kills chronologiquement
+            PipelineStage("enrich", self._stage_enrich, workers("enrich"), self.queue_size, ordered=True),
+            PipelineStage("render", self._stage_render, workers("render"), self.queue_size, ordered=True),
+            PipelineStage("deliver", self._stage_deliver, max_queue=self.queue_size),
+            PipelineStage("persist", self._stage_persist, max_queue=self.queue_size)
+        ], on_error=self._on_stage_error)
+    
+    @staticmethod
+    def _on_stage_error(item, error: Exception):
+        """Un kill perdu par un étage est rendu à son curseur pour être sélectionné au prochain fetch."""
+        if isinstance(item, KillFeedItem):
+            item.release()
+    
+    async def _stage_fetch(self, _tick) -> List[Tuple[List[Tuple[KillSource, List[KillEvent]]], float]]:
+        """Télécharge les kills de tous les serveurs disponibles, en parallèle.
+        
+        Chaque serveur a son propre délai maximal ; un serveur en erreur est
+        mis de côté (recul exponentiel) sans retarder les autres.
+        """
+        started = time.perf_counter()
+        sources = [source for source in self.sources if source.health.available]
+        if not sources:
+            return []
+        results = await asyncio.gather(*(source.fetch() for source in sources), return_exceptions=True)
+        duration = time.perf_counter() - started
+        
+        fetched = []
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Erreur lors de la récupération des kills ({source.server}): {type(result).__name__} {result}")
+            else:
+                fetched.append((source, result))
+        if not fetched:
+            self.scheduler.record_error(duration)
+            return []
+        return [(fetched, duration)]
+    
+    async def _stage_dedupe(
+        self,
+        fetched: Tuple[List[Tuple[KillSource, List[KillEvent]]], Optional[float]]
+    ) -> List[KillFeedItem]:
+        """Ne garde que les kills non encore ingérés (curseur par serveur) et les fusionne par timestamp.
+        
+        Les kills sont seulement réservés : le curseur n'est confirmé qu'à l'étage persist.
+        Une durée None indique des kills poussés par le webhook (hors polling).
+        """
+        results, duration = fetched
+        streams = []
+        sources: Dict[int, KillSource] = {}
+        for source, kills in results:
+            new_kills = source.select_new(kills)
+            for kill in new_kills:
+                if len(self.sources) > 1:
+                    kill.server = source.server
+                sources[id(kill)] = source
+            streams.append(new_kills)
+        new_kills = merge_by_timestamp(streams)
+        
+        if duration is not None:
+            self.scheduler.record_success(len(new_kills), duration)
+        now = time.monotonic()
+        return [KillFeedItem(kill, now, sources[id(kill)]) for kill in new_kills]
+    
+    async def _stage_enrich(self, item: KillFeedItem) -> List[KillFeedItem]:
+        """Met à jour l'état local (leaderboard, classements par période, ...)."""
+        for listener in self._kill_listeners:
+            listener(item.kill)
+        return [item]
+    
+    async def _stage_render(self, item: KillFeedItem) -> List[KillFeedItem]:
+        """Prépare l'embed Discord du kill."""
+        item.embed = MinecraftViews.create_killfeed_embed(item.kill)
+        return [item]
+    
+    async def _stage_deliver(self, item: KillFeedItem) -> List[KillFeedItem]:
+        """Publie le kill sur le bus : chaque canal abonné dont le filtre correspond le met en file."""
+        self.bus.publish(item.kill, item.embed)
+        return [item]
+    
+    async def _stage_persist(self, item: KillFeedItem) -> List[KillFeedItem]:
+        """Enregistre le kill (base locale, Google Sheets en écriture différée) puis confirme le curseur.
+        
+        Un kill perdu plus tôt dans le pipeline reste réservé : le point de
+        reprise sauvegardé ne le dépasse pas et il sera rejoué au redémarrage.
+        """
+        try:
+            for sink in self._kill_sinks:
+                sink(item.kill)
+            if self.sheets_writer:
+                self.sheets_writer.log_kill(item.kill)
+        finally:
+            # Déjà envoyé sur Discord : confirmer même si un enregistrement échoue, pour ne pas le republier
+            if item.source is not None:
+                item.source.commit(item.kill)
+        return []
     
-
-
     ### Monitoring ###
     async def _monitor_kills(self):
-        """Boucle de monitoring des kills."""
+        """Boucle de polling : déclenche un fetch puis attend selon l'intervalle adaptatif."""
         while self.is_monitoring:
-            try:
-                kills = await self.api_client.get_kills()
-                
-                # Filtrer les nouveaux kills
-                new_kills = [
-                    kill for kill in kills 
-                    if kill.timestamp > self.last_kill_timestamp
-                ]
-                
-                # Mettre à jour le timestamp
-                if kills:
-                    self.last_kill_timestamp = max(kill.timestamp for kill in kills)
-                
-                # Afficher les nouveaux kills et les enregistrer dans Google Sheets
-                if self.is_monitoring:
-                    for kill in new_kills:
-                        embed = MinecraftViews.create_killfeed_embed(kill)
-                        await self.channel.send(embed=embed)
-                        # Enregistrer dans Google Sheets
-                        self.sheets_service.log_kill(kill)
-                
-            except Exception as e:
-                print(f"Erreur lors du monitoring des kills: {e}")
-            
-            # Attendre avant la prochaine vérification
-            await asyncio.sleep(self.check_interval) 
\ No newline at end of file
+            await self.pipeline.submit(time.time())
+            # Attendre le tri des nouveaux kills (et la backpressure éventuelle)
+            await self.pipeline.drain(until="dedupe")
+            await asyncio.sleep(self.scheduler.next_delay())
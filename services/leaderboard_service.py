@@ -0,0 +1,132 @@
+import logging
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from api.models import KillEvent, RankingType
+from services.stats_warmer import StatsSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Types de classement maintenus par le leaderboard
+TRACKED_TYPES = (RankingType.KILLS, RankingType.DEATHS, RankingType.KD_RATIO)
+
+@dataclass
+class PlayerScore:
+    """Compteurs d'un joueur dans le leaderboard."""
+    player_name: str
+    kills: int = 0
+    deaths: int = 0
+
+def compute_score(kills: int, deaths: int, ranking_type: RankingType) -> float:
+    """Calcule le score selon le type de classement."""
+    if ranking_type == RankingType.KD_RATIO:
+        if deaths > 0:
+            return kills / deaths
+        elif kills > 0:
+            return float('inf')
+        return 0.0
+    elif ranking_type == RankingType.KILLS:
+        return kills
+    else:  # DEATHS
+        return deaths
+
+class LeaderboardService:
+    """Leaderboard matérialisé, mis à jour de façon incrémentale.
+    
+    Alimenté par les `KillEvent` du killfeed et réconcilié avec chaque
+    instantané du `StatsWarmer`, qui corrige la dérive.
+    Chaque type de classement est une liste triée de clés `(-score, nom)` :
+    une mise à jour coûte deux recherches bisect, un top-k est un simple découpage.
+    """
+    
+    def __init__(self):
+        self.is_ready = False
+        self.last_reconcile: Optional[float] = None
+        # Incrémentée à chaque changement (clé du cache des pages rendues)
+        self.version = 0
+        self._players: Dict[str, PlayerScore] = {}
+        self._orders: Dict[RankingType, List[Tuple[float, str]]] = {t: [] for t in TRACKED_TYPES}
+    
+    def __len__(self) -> int:
+        return len(self._players)
+    
+    ### Réconciliation ###
+    def reconcile(self, snapshot: StatsSnapshot):
+        """Remplace l'état courant par les totaux d'un instantané du `StatsWarmer`.
+        
+        Les joueurs sans statistiques dans l'instantané gardent leurs compteurs.
+        """
+        scores = []
+        missing = 0
+        for player in snapshot.players:
+            stats = snapshot.player_stats(player.player_uuid)
+            if stats is not None:
+                kill_data = stats.kill_data
+                scores.append(PlayerScore(player.player_name, kill_data.player_kills_total, kill_data.deaths_total))
+                continue
+            missing += 1
+            current = self._players.get(self._key(player.player_name))
+            if current:
+                scores.append(current)
+        
+        self.load(scores)
+        self.last_reconcile = snapshot.taken_at
+        if missing:
+            logger.warning(f"Leaderboard réconcilié avec {missing} joueurs sans statistiques")
+    
+    ### Mise à jour ###
+    def load(self, scores: List[PlayerScore]):
+        """Remplace entièrement le contenu du leaderboard."""
+        self._players = {self._key(s.player_name): s for s in scores}
+        for ranking_type in TRACKED_TYPES:
+            self._orders[ranking_type] = sorted(
+                self._sort_key(s, ranking_type) for s in self._players.values()
+            )
+        self.is_ready = True
+        self.version += 1
+    
+    def record_kill(self, kill: KillEvent):
+        """Applique un événement de kill : +1 kill au tueur, +1 mort à la victime."""
+        if kill.killer and kill.killer != "Unknown":
+            self._increment(kill.killer, kills=1)
+        if kill.victim and kill.victim != "Unknown":
+            self._increment(kill.victim, deaths=1)
+    
+    def _increment(self, player_name: str, kills: int = 0, deaths: int = 0):
+        key = self._key(player_name)
+        score = self._players.get(key)
+        if score is None:
+            score = self._players[key] = PlayerScore(player_name)
+        else:
+            for ranking_type in TRACKED_TYPES:
+                self._discard(self._orders[ranking_type], self._sort_key(score, ranking_type))
+        
+        score.kills += kills
+        score.deaths += deaths
+        self.version += 1
+        for ranking_type in TRACKED_TYPES:
+            insort(self._orders[ranking_type], self._sort_key(score, ranking_type))
+    
+    ### Lecture ###
+    def top(self, ranking_type: RankingType, limit: int = 10) -> List[tuple]:
+        """Retourne les `limit` premiers joueurs : (nom, kills, morts, score)."""
+        ranking = []
+        for neg_score, key in self._orders[ranking_type][:limit]:
+            score = self._players[key]
+            ranking.append((score.player_name, score.kills, score.deaths, -neg_score))
+        return ranking
+    
+    ### Utilitaires ###
+    @staticmethod
+    def _key(player_name: str) -> str:
+        return player_name.casefold()
+    
+    @classmethod
+    def _sort_key(cls, score: PlayerScore, ranking_type: RankingType) -> Tuple[float, str]:
+        return (-compute_score(score.kills, score.deaths, ranking_type), cls._key(score.player_name))
+    
+    @staticmethod
+    def _discard(order: List[Tuple[float, str]], item: Tuple[float, str]):
+        index = bisect_left(order, item)
+        if index < len(order) and order[index] == item:
+            del order[index]
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Un handler reçoit un élément et retourne la liste des éléments à transmettre
+StageHandler = Callable[[Any], Awaitable[List[Any]]]
+# Appelé avec l'élément perdu et l'exception quand un handler échoue
+ErrorHandler = Callable[[Any, Exception], None]
+
+class PipelineStage:
+    """Étage d'un pipeline : une file bornée et N workers.
+    
+    Chaque élément retourné par le handler est transmis à l'étage suivant ;
+    si sa file est pleine, le worker attend (backpressure). Avec `ordered`,
+    les résultats de plusieurs workers sont transmis dans l'ordre d'arrivée
+    des éléments (un élément en échec libère simplement son tour).
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        workers: int = 1,
+        max_queue: int = 100,
+        ordered: bool = False
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.ordered = ordered and workers > 1
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.next: Optional["PipelineStage"] = None
+        self.on_error: Optional[ErrorHandler] = None
+        self._tasks: List[asyncio.Task] = []
+        # Tours de transmission (mode `ordered`) : ticket pris à la sortie de file
+        self._tickets = 0
+        self._emitted = 0
+        self._turn = asyncio.Condition()
+        
+        # Statistiques
+        self.processed = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.started_at: Optional[float] = None
+    
+    def start(self):
+        self.started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def stats(self) -> Dict[str, float]:
+        """Profondeur de file, débit (éléments/min) et latence moyenne/max (ms)."""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "processed": self.processed,
+            "errors": self.errors,
+            "throughput_per_min": self.processed * 60 / elapsed if elapsed else 0.0,
+            "avg_latency_ms": self.total_latency * 1000 / self.processed if self.processed else 0.0,
+            "max_latency_ms": self.max_latency * 1000
+        }
+    
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            ticket = self._tickets
+            self._tickets += 1
+            try:
+                started = time.perf_counter()
+                try:
+                    outputs = await self.handler(item)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.errors += 1
+                    outputs = []
+                    logger.error(f"Erreur dans l'étage '{self.name}' du pipeline: {e}")
+                    if self.on_error is not None:
+                        try:
+                            self.on_error(item, e)
+                        except Exception as hook_error:
+                            logger.error(f"Erreur lors du traitement de l'échec de l'étage '{self.name}': {hook_error}")
+                latency = time.perf_counter() - started
+                self.processed += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+                
+                if self.ordered:
+                    async with self._turn:
+                        await self._turn.wait_for(lambda: self._emitted == ticket)
+                        await self._forward(outputs)
+                        self._emitted += 1
+                        self._turn.notify_all()
+                else:
+                    await self._forward(outputs)
+            finally:
+                self.queue.task_done()
+    
+    async def _forward(self, outputs: Optional[List[Any]]):
+        if self.next is not None:
+            for output in outputs or ():
+                await self.next.queue.put(output)
+
+class Pipeline:
+    """Enchaînement d'étages reliés par des files `asyncio.Queue` bornées.
+    
+    Un élément dont le handler échoue est abandonné, après appel de `on_error`.
+    """
+    
+    def __init__(self, stages: List[PipelineStage], on_error: Optional[ErrorHandler] = None):
+        self.stages = stages
+        for current, following in zip(stages, stages[1:]):
+            current.next = following
+        for stage in stages:
+            stage.on_error = on_error
+    
+    def stage(self, name: str) -> PipelineStage:
+        return next(stage for stage in self.stages if stage.name == name)
+    
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+    
+    async def stop(self, drain_timeout: float = 10):
+        """Laisse les étages se vider (dans la limite du délai) puis les arrête."""
+        try:
+            await asyncio.wait_for(self.drain(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Pipeline arrêté avant d'avoir été entièrement vidé")
+        for stage in self.stages:
+            await stage.stop()
+    
+    async def drain(self, until: Optional[str] = None):
+        """Attend que les étages (jusqu'à `until` inclus) aient traité leurs éléments."""
+        for stage in self.stages:
+            await stage.queue.join()
+            if stage.name == until:
+                break
+    
+    async def submit(self, item: Any):
+        """Injecte un élément dans le premier étage."""
+        await self.stages[0].queue.put(item)
+    
+    def stats(self) -> List[Dict[str, float]]:
+        return [stage.stats() for stage in self.stages]
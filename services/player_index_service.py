@@ -0,0 +1,98 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+from api.minecraft_client import MinecraftAPIClient
+from api.models import MinecraftPlayer
+
+class PlayerIndexService:
+    """Index en mémoire nom de joueur → joueur, insensible à la casse.
+    
+    - `lookup` : recherche exacte en O(1) via un dictionnaire.
+    - `autocomplete` : recherche par préfixe via bisect sur une liste triée.
+    """
+    
+    def __init__(self):
+        self._by_name: Dict[str, MinecraftPlayer] = {}
+        self._by_uuid: Dict[str, MinecraftPlayer] = {}
+        self._sorted_names: List[str] = []
+        self._refreshed_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._by_name)
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Normalise un nom pour les comparaisons."""
+        return name.casefold()
+    
+    async def refresh(self, api_client: MinecraftAPIClient, max_age: float = 30):
+        """Recharge l'index depuis `/v1/playersTable` lu en flux, au plus une fois par `max_age` secondes."""
+        async with self._refresh_lock:
+            if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < max_age:
+                return
+            self.update([player async for player in api_client.iter_players()])
+            self._refreshed_at = time.monotonic()
+    
+    def update(self, players: List[MinecraftPlayer]):
+        """Applique de façon incrémentale les ajouts, renommages et suppressions."""
+        seen = set()
+        changed = []
+        for player in players:
+            seen.add(player.player_uuid)
+            current = self._by_uuid.get(player.player_uuid)
+            if current is None or current.player_name != player.player_name:
+                changed.append((current, player))
+            else:
+                # Données à jour (last_seen, etc.) sans toucher à l'ordre
+                self._by_uuid[player.player_uuid] = player
+                self._by_name[self.normalize(player.player_name)] = player
+        
+        removed = [p for uuid, p in self._by_uuid.items() if uuid not in seen]
+        
+        # Au-delà d'un certain volume, reconstruire la liste triée est plus rapide
+        if len(changed) + len(removed) > len(self._sorted_names) // 8:
+            self._by_uuid = {p.player_uuid: p for p in players}
+            self._by_name = {self.normalize(p.player_name): p for p in players}
+            self._sorted_names = sorted(self._by_name)
+            return
+        
+        for player in removed:
+            self._remove(player)
+        for old, new in changed:
+            if old is not None:
+                self._remove(old)
+            self._add(new)
+    
+    def lookup(self, name: str) -> Optional[MinecraftPlayer]:
+        """Retourne le joueur correspondant exactement au nom (casse ignorée)."""
+        return self._by_name.get(self.normalize(name))
+    
+    def autocomplete(self, prefix: str, limit: int = 25) -> List[str]:
+        """Retourne jusqu'à `limit` noms de joueurs commençant par `prefix`."""
+        key = self.normalize(prefix)
+        start = bisect_left(self._sorted_names, key)
+        results = []
+        for name in self._sorted_names[start:start + limit]:
+            if not name.startswith(key):
+                break
+            results.append(self._by_name[name].player_name)
+        return results
+    
+    def _add(self, player: MinecraftPlayer):
+        name = self.normalize(player.player_name)
+        self._by_uuid[player.player_uuid] = player
+        if name not in self._by_name:
+            insort(self._sorted_names, name)
+        self._by_name[name] = player
+    
+    def _remove(self, player: MinecraftPlayer):
+        name = self.normalize(player.player_name)
+        self._by_uuid.pop(player.player_uuid, None)
+        current = self._by_name.get(name)
+        if current is not None and current.player_uuid == player.player_uuid:
+            del self._by_name[name]
+            index = bisect_left(self._sorted_names, name)
+            if index < len(self._sorted_names) and self._sorted_names[index] == name:
+                del self._sorted_names[index]
@@ -0,0 +1,66 @@
+import random
+from bisect import bisect_left
+from typing import List, Tuple
+
+# Bornes (secondes) de l'histogramme des durées de polling
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class AdaptivePollScheduler:
+    """Intervalle de polling adaptatif.
+    
+    - Des kills arrivent : l'intervalle revient au minimum.
+    - Aucun kill : l'intervalle augmente exponentiellement jusqu'au maximum.
+    - Erreur API : recul plus fort (`error_factor`).
+    Un jitter aléatoire évite de solliciter Plan à intervalles parfaitement réguliers.
+    """
+    
+    def __init__(
+        self,
+        min_interval: float = 5,
+        max_interval: float = 300,
+        initial_interval: float = 30,
+        backoff_factor: float = 1.5,
+        error_factor: float = 3,
+        jitter: float = 0.1
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.error_factor = error_factor
+        self.jitter = jitter
+        self.interval = self._clamp(initial_interval)
+        self.consecutive_errors = 0
+        self.polls = 0
+        self._histogram = [0] * (len(DURATION_BUCKETS) + 1)
+    
+    def record_success(self, new_events: int, duration: float):
+        """Enregistre un polling réussi et ajuste l'intervalle."""
+        self._observe(duration)
+        self.consecutive_errors = 0
+        if new_events > 0:
+            self.interval = self.min_interval
+        else:
+            self.interval = self._clamp(self.interval * self.backoff_factor)
+    
+    def record_error(self, duration: float):
+        """Enregistre un polling en échec et recule davantage."""
+        self._observe(duration)
+        self.consecutive_errors += 1
+        self.interval = self._clamp(self.interval * self.error_factor)
+    
+    def next_delay(self) -> float:
+        """Délai avant le prochain polling, jitter inclus."""
+        spread = self.interval * self.jitter
+        return self._clamp(self.interval + random.uniform(-spread, spread))
+    
+    def histogram(self) -> List[Tuple[str, int]]:
+        """Histogramme des durées de polling : [(libellé, nombre)]."""
+        labels = [f"≤{bound:g}s" for bound in DURATION_BUCKETS] + [f">{DURATION_BUCKETS[-1]:g}s"]
+        return list(zip(labels, self._histogram))
+    
+    def _observe(self, duration: float):
+        self.polls += 1
+        self._histogram[bisect_left(DURATION_BUCKETS, duration)] += 1
+    
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
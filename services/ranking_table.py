@@ -0,0 +1,171 @@
+import heapq
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from api.models import KillData, MinecraftPlayer, RankingType
+
+# NumPy est optionnel : sans lui, les mêmes calculs se font en Python pur
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Colonnes de la table, dans l'ordre des champs de `KillData`
+COLUMNS = {
+    "kills": "player_kills_total",
+    "deaths": "deaths_total",
+    "kills_7d": "player_kills_7d",
+    "deaths_7d": "deaths_7d",
+    "mob_kills": "mob_kills_total"
+}
+
+# Classements servis par `/v1/playersTable` : attribut de `MinecraftPlayer` classé
+PLAYER_ATTRIBUTES = {
+    RankingType.PLAYTIME: "playtime_active",
+    RankingType.ACTIVITY: "activity_index",
+    RankingType.PING: "ping_average",
+    RankingType.SESSIONS: "session_count"
+}
+
+class RankingTable:
+    """Statistiques de combat de tous les joueurs, stockées en colonnes contiguës.
+    
+    Chaque colonne est un `array('q')` (entiers 64 bits) : avec NumPy, elle
+    est vue sans copie comme un tableau et les scores, le tri et la sélection
+    du top-k sont vectorisés. Les égalités gardent l'ordre d'insertion.
+    """
+    
+    def __init__(self):
+        self.names: List[str] = []
+        self._columns: Dict[str, array] = {name: array("q") for name in COLUMNS}
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def append(self, player_name: str, kill_data: KillData):
+        self.names.append(player_name)
+        for name, attribute in COLUMNS.items():
+            self._columns[name].append(getattr(kill_data, attribute))
+    
+    def column(self, name: str) -> Sequence[int]:
+        """Colonne `name` (tableau NumPy si disponible)."""
+        values = self._columns[name]
+        if np is not None:
+            return np.frombuffer(values, dtype=np.int64) if values else np.zeros(0, dtype=np.int64)
+        return values
+    
+    def scores(self, ranking_type: RankingType) -> Sequence[float]:
+        """Score de chaque joueur ; un K/D sans mort vaut +inf (0 sans kill ni mort)."""
+        if ranking_type.from_players_table:
+            raise ValueError(f"Classement '{ranking_type.value}' : utiliser rank_players")
+        kills = self.column("kills")
+        deaths = self.column("deaths")
+        if ranking_type == RankingType.KILLS:
+            return kills
+        if ranking_type == RankingType.DEATHS:
+            return deaths
+        
+        if np is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratios = kills / deaths
+            return np.where(deaths > 0, ratios, np.where(kills > 0, np.inf, 0.0))
+        return [
+            k / d if d > 0 else (math.inf if k > 0 else 0.0)
+            for k, d in zip(kills, deaths)
+        ]
+    
+    def top(self, ranking_type: RankingType, limit: Optional[int] = None) -> List[tuple]:
+        """Les `limit` premiers joueurs (tous si None) : (nom, kills, morts, score)."""
+        scores = self.scores(ranking_type)
+        count = len(self) if limit is None else max(0, min(limit, len(self)))
+        if count == 0:
+            return []
+        
+        if np is not None:
+            order = _top_indices_numpy(np.asarray(scores, dtype=np.float64), count)
+            scores = scores[order].tolist()
+        else:
+            order = _top_indices_python(scores, count)
+            scores = [scores[i] for i in order]
+        
+        kills = self._columns["kills"]
+        deaths = self._columns["deaths"]
+        return [
+            (self.names[i], kills[i], deaths[i], score)
+            for i, score in zip(order, scores)
+        ]
+
+def _top_indices_numpy(scores, count: int) -> List[int]:
+    """Indices des `count` meilleurs scores (décroissants, égalités dans l'ordre d'origine)."""
+    # Tri croissant de -score ; NaN relégué en dernier
+    keys = -np.nan_to_num(scores, nan=-np.inf, posinf=np.inf, neginf=-np.inf)
+    if count < len(keys):
+        # Partition en O(n), puis tri des seuls candidats (égalités au seuil comprises)
+        threshold = np.partition(keys, count - 1)[count - 1]
+        candidates = np.flatnonzero(keys <= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    order = candidates[np.argsort(keys[candidates], kind="stable")]
+    return order[:count].tolist()
+
+def _top_indices_python(scores: Sequence[float], count: int) -> List[int]:
+    key = lambda i: -math.inf if math.isnan(scores[i]) else scores[i]
+    if count < len(scores):
+        return heapq.nlargest(count, range(len(scores)), key=key)
+    return sorted(range(len(scores)), key=key, reverse=True)
+
+def rank_players(
+    players: Sequence[MinecraftPlayer],
+    ranking_type: RankingType,
+    limit: Optional[int] = None
+) -> List[Tuple[str, float]]:
+    """Classement tiré de `/v1/playersTable` seul : (nom, valeur), sans requête par joueur.
+    
+    Pour le ping, le plus faible est le meilleur et les joueurs sans mesure sont ignorés.
+    """
+    attribute = PLAYER_ATTRIBUTES[ranking_type]
+    if ranking_type == RankingType.PING:
+        players = [p for p in players if p.ping_average > 0]
+    values = [getattr(p, attribute) for p in players]
+    count = len(values) if limit is None else max(0, min(limit, len(values)))
+    if count == 0:
+        return []
+    
+    if np is not None:
+        scores = np.fromiter(values, dtype=np.float64, count=len(values))
+        order = _top_indices_numpy(-scores if ranking_type == RankingType.PING else scores, count)
+    else:
+        scores = [-v for v in values] if ranking_type == RankingType.PING else values
+        order = _top_indices_python(scores, count)
+    return [(players[i].player_name, values[i]) for i in order]
+
+def _benchmark():
+    """Point d'entrée de mesure : `python -m services.ranking_table [joueurs]`."""
+    import random
+    import sys
+    import time
+    
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    table = RankingTable()
+    players = []
+    for i in range(count):
+        kills, deaths = random.randint(0, 500), random.randint(0, 300)
+        table.append(f"Player{i}", KillData(kills, deaths, kills // 10, deaths // 10, "0", random.randint(0, 5000)))
+        players.append(MinecraftPlayer(
+            f"uuid-{i}", f"Player{i}", random.uniform(0, 5), random.randint(0, 10**9), random.randint(0, 500),
+            "", "", random.randint(0, 300), 0, 0
+        ))
+    
+    print(f"{count} joueurs, {'NumPy' if np is not None else 'Python pur'}")
+    for ranking_type in RankingType:
+        for limit in (10, None):
+            started = time.perf_counter()
+            if ranking_type.from_players_table:
+                rank_players(players, ranking_type, limit)
+            else:
+                table.top(ranking_type, limit)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"  {ranking_type.value:<9} top {limit or 'complet':<8} {elapsed:8.2f} ms")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Iterable, List, Mapping, Optional, Tuple
+from api.models import MinecraftPlayer, MinecraftPlayerStats
+from services.ranking_table import RankingTable
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """Instantané immuable des joueurs et de leurs statistiques, servi aux commandes."""
+    version: int
+    taken_at: float  # time.time() à la fin du rafraîchissement
+    players: Tuple[MinecraftPlayer, ...]
+    stats: Mapping[str, MinecraftPlayerStats]  # par UUID
+    ranking: RankingTable
+    errors: int = 0
+    duration: float = 0.0
+    
+    @property
+    def age(self) -> float:
+        """Âge des données en secondes."""
+        return max(0.0, time.time() - self.taken_at)
+    
+    def player_stats(self, player_uuid: str) -> Optional[MinecraftPlayerStats]:
+        return self.stats.get(player_uuid)
+
+def activity_priority(player: MinecraftPlayer) -> Tuple[float, float]:
+    """Clé de priorité : dernière connexion puis indice d'activité (plus grand d'abord).
+    
+    `last_seen` est un timestamp (ms) ou une date ISO selon la version de Plan ;
+    une valeur illisible place le joueur en fin de file.
+    """
+    last_seen = player.last_seen
+    try:
+        seen = float(last_seen)
+    except (TypeError, ValueError):
+        try:
+            seen = datetime.fromisoformat(str(last_seen)).timestamp() * 1000
+        except ValueError:
+            seen = 0.0
+    return seen, player.activity_index or 0.0
+
+class StatsWarmer:
+    """Rafraîchit en arrière-plan les statistiques de tous les joueurs.
+    
+    Les joueurs récemment actifs sont interrogés en premier, avec au plus
+    `max_concurrency` requêtes en vol. Le nouvel instantané remplace l'ancien
+    en une seule affectation : une commande lit toujours un état cohérent,
+    sans appel à Plan. Un joueur en erreur garde ses statistiques précédentes.
+    """
+    
+    def __init__(self, interval: float = 300, max_concurrency: Optional[int] = None):
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.snapshot: Optional[StatsSnapshot] = None
+        self.last_error: Optional[str] = None
+        self._listeners: List[Callable[[StatsSnapshot], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+    
+    def add_listener(self, listener: Callable[[StatsSnapshot], None]):
+        """Enregistre une fonction appelée à chaque nouvel instantané."""
+        self._listeners.append(listener)
+    
+    async def wait_snapshot(self, timeout: Optional[float] = None) -> StatsSnapshot:
+        """Attend le premier instantané (lève `asyncio.TimeoutError` après `timeout` secondes)."""
+        if self.snapshot is None:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.snapshot
+    
+    ### Cycle de vie ###
+    def start(self, api_client):
+        """Lance le premier rafraîchissement puis les suivants toutes les `interval` secondes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._warm_loop(api_client))
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _warm_loop(self, api_client):
+        while True:
+            try:
+                snapshot = await self.refresh(api_client)
+                logger.info(
+                    f"Statistiques rafraîchies : {len(snapshot.players)} joueurs en {snapshot.duration:.1f}s "
+                    f"({snapshot.errors} en erreur), version {snapshot.version}"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"Erreur lors du rafraîchissement des statistiques: {e}")
+            await asyncio.sleep(self.interval)
+    
+    ### Rafraîchissement ###
+    async def refresh(self, api_client) -> StatsSnapshot:
+        """Recharge joueurs et statistiques depuis Plan et publie un nouvel instantané.
+        
+        `/v1/playersTable` est lu en flux : seuls les joueurs sont gardés, pas la réponse.
+        """
+        started = time.perf_counter()
+        players = [player async for player in api_client.iter_players()]
+        previous = self.snapshot
+        
+        stats = {}
+        errors = 0
+        prioritized = sorted(players, key=activity_priority, reverse=True)
+        async for player, player_stats, error in api_client.iter_player_stats(
+            _iterate(prioritized), self.max_concurrency, refresh=True
+        ):
+            if player_stats is None:
+                errors += 1
+                logger.debug(f"Statistiques indisponibles pour {player.player_uuid}: {error}")
+                player_stats = previous.player_stats(player.player_uuid) if previous else None
+            if player_stats is not None:
+                stats[player.player_uuid] = player_stats
+        
+        # Ordre de playersTable : les égalités du classement restent stables d'un instantané à l'autre
+        ranking = RankingTable()
+        for player in players:
+            player_stats = stats.get(player.player_uuid)
+            if player_stats is not None and player_stats.kill_data:
+                ranking.append(player.player_name, player_stats.kill_data)
+        
+        snapshot = StatsSnapshot(
+            version=previous.version + 1 if previous else 1,
+            taken_at=time.time(),
+            players=tuple(players),
+            stats=MappingProxyType(stats),
+            ranking=ranking,
+            errors=errors,
+            duration=time.perf_counter() - started
+        )
+        self.snapshot = snapshot
+        self.last_error = None
+        self._ready.set()
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Erreur lors de la diffusion de l'instantané des statistiques: {e}")
+        return snapshot
+
+async def _iterate(items: Iterable) -> AsyncIterator:
+    for item in items:
+        yield item
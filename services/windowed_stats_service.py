@@ -0,0 +1,147 @@
+import heapq
+import logging
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from api.models import KillEvent, RankingType
+from services.event_store_service import EventStoreService
+from services.leaderboard_service import compute_score
+
+logger = logging.getLogger(__name__)
+
+HOUR_MS = 3_600_000
+
+class PlayerBuckets:
+    """Compteurs horaires d'un joueur, stockés en sommes cumulées.
+    
+    `hours[i]` est un numéro d'heure (timestamp // 1h) et `cum_kills[i]` le
+    total des kills jusqu'à cette heure incluse : le total d'une fenêtre se
+    calcule par une soustraction après une recherche bisect.
+    """
+    __slots__ = ("player_name", "hours", "cum_kills", "cum_deaths", "base_kills", "base_deaths")
+    
+    def __init__(self, player_name: str):
+        self.player_name = player_name
+        self.hours: List[int] = []
+        self.cum_kills: List[int] = []
+        self.cum_deaths: List[int] = []
+        # Totaux des buckets déjà purgés
+        self.base_kills = 0
+        self.base_deaths = 0
+    
+    def add(self, hour: int, kills: int = 0, deaths: int = 0):
+        """Ajoute des kills/morts dans le bucket de l'heure donnée."""
+        if not self.hours or hour > self.hours[-1]:
+            self.hours.append(hour)
+            self.cum_kills.append(self._total(self.cum_kills, self.base_kills) + kills)
+            self.cum_deaths.append(self._total(self.cum_deaths, self.base_deaths) + deaths)
+            return
+        
+        # Événement en retard : insérer/mettre à jour puis décaler les cumuls suivants
+        index = bisect_left(self.hours, hour)
+        if index == len(self.hours) or self.hours[index] != hour:
+            previous_kills = self.cum_kills[index - 1] if index else self.base_kills
+            previous_deaths = self.cum_deaths[index - 1] if index else self.base_deaths
+            self.hours.insert(index, hour)
+            self.cum_kills.insert(index, previous_kills)
+            self.cum_deaths.insert(index, previous_deaths)
+        for i in range(index, len(self.hours)):
+            self.cum_kills[i] += kills
+            self.cum_deaths[i] += deaths
+    
+    def window(self, since_hour: int) -> Tuple[int, int]:
+        """Retourne (kills, morts) depuis l'heure `since_hour` incluse."""
+        if not self.hours:
+            return 0, 0
+        index = bisect_left(self.hours, since_hour)
+        before_kills = self.cum_kills[index - 1] if index else self.base_kills
+        before_deaths = self.cum_deaths[index - 1] if index else self.base_deaths
+        return self.cum_kills[-1] - before_kills, self.cum_deaths[-1] - before_deaths
+    
+    def prune(self, before_hour: int):
+        """Supprime les buckets antérieurs à `before_hour`."""
+        index = bisect_left(self.hours, before_hour)
+        if index:
+            self.base_kills = self.cum_kills[index - 1]
+            self.base_deaths = self.cum_deaths[index - 1]
+            del self.hours[:index]
+            del self.cum_kills[:index]
+            del self.cum_deaths[:index]
+    
+    @staticmethod
+    def _total(cumulative: List[int], base: int) -> int:
+        return cumulative[-1] if cumulative else base
+
+class WindowedStatsService:
+    """Classements sur fenêtre glissante (24 h, 7 j, 30 j ou personnalisée).
+    
+    Calculés localement à partir des kills conservés, sans aucun appel à Plan :
+    une fenêtre coûte O(joueurs × log buckets).
+    """
+    
+    def __init__(self, retention_hours: int = 30 * 24):
+        self.retention_hours = retention_hours
+        self._players: Dict[str, PlayerBuckets] = {}
+    
+    def __len__(self) -> int:
+        return len(self._players)
+    
+    async def load(self, event_store: EventStoreService):
+        """Initialise les compteurs depuis l'historique de la base locale."""
+        since = (self._current_hour() - self.retention_hours) * HOUR_MS
+        kills = await event_store.get_kills(since=since)
+        self._players.clear()
+        for kill in kills:
+            self.record_kill(kill)
+        logger.info(f"Classements par période initialisés avec {len(kills)} kills")
+    
+    def record_kill(self, kill: KillEvent):
+        """Comptabilise un kill dans le bucket horaire correspondant."""
+        timestamp = kill.timestamp or int(time.time() * 1000)
+        hour = timestamp // HOUR_MS
+        if hour < self._current_hour() - self.retention_hours:
+            return
+        if kill.killer and kill.killer != "Unknown":
+            self._buckets(kill.killer).add(hour, kills=1)
+        if kill.victim and kill.victim != "Unknown":
+            self._buckets(kill.victim).add(hour, deaths=1)
+    
+    def prune(self):
+        """Purge les buckets sortis de la période de rétention."""
+        before = self._current_hour() - self.retention_hours
+        for key in list(self._players):
+            buckets = self._players[key]
+            buckets.prune(before)
+            if not buckets.hours:
+                del self._players[key]
+    
+    def top(
+        self,
+        ranking_type: RankingType,
+        hours: int,
+        limit: Optional[int] = 10
+    ) -> List[tuple]:
+        """Classement sur les `hours` dernières heures : (nom, kills, morts, score)."""
+        since_hour = self._current_hour() - min(hours, self.retention_hours) + 1
+        rows = []
+        for buckets in self._players.values():
+            kills, deaths = buckets.window(since_hour)
+            if kills or deaths:
+                score = compute_score(kills, deaths, ranking_type)
+                rows.append((buckets.player_name, kills, deaths, score))
+        
+        key = lambda row: (row[3], row[1])
+        if limit is None:
+            return sorted(rows, key=key, reverse=True)
+        return heapq.nlargest(limit, rows, key=key)
+    
+    def _buckets(self, player_name: str) -> PlayerBuckets:
+        key = player_name.casefold()
+        buckets = self._players.get(key)
+        if buckets is None:
+            buckets = self._players[key] = PlayerBuckets(player_name)
+        return buckets
+    
+    @staticmethod
+    def _current_hour() -> int:
+        return int(time.time() * 1000) // HOUR_MS
@@ -0,0 +1,24 @@
+import time
+import pytest
+from services.kill_webhook import MAX_CLOCK_SKEW_MS, parse_kill_event, parse_kill_payload
+
+def _kill(timestamp: int) -> dict:
+    return {"killer": "Alice", "victim": "Bob", "weapon": "Diamond Sword", "timestamp": timestamp}
+
+def test_accepts_current_timestamp():
+    now = int(time.time() * 1000)
+    assert parse_kill_event(_kill(now)).timestamp == now
+
+def test_accepts_small_clock_skew():
+    ahead = int(time.time() * 1000) + MAX_CLOCK_SKEW_MS // 2
+    assert parse_kill_event(_kill(ahead)).timestamp == ahead
+
+def test_rejects_future_timestamp():
+    ahead = int(time.time() * 1000) + MAX_CLOCK_SKEW_MS + 60_000
+    with pytest.raises(ValueError, match="futur"):
+        parse_kill_event(_kill(ahead))
+
+def test_rejects_far_future_timestamp_in_batch():
+    now = int(time.time() * 1000)
+    with pytest.raises(ValueError, match="kill #1"):
+        parse_kill_payload([_kill(now), _kill(10 ** 18)])
@@ -1,7 +1,9 @@
 import logging
+import math
 from functools import wraps
 from typing import Callable, Any
-from api.minecraft_client import APIError
+import discord
+from api.minecraft_client import APIError, CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +13,17 @@ def handle_api_errors(func: Callable) -> Callable:
     async def wrapper(*args, **kwargs) -> Any:
         try:
             return await func(*args, **kwargs)
+        except CircuitOpenError as e:
+            # Plan est indisponible : répondre tout de suite plutôt que laisser la commande en attente
+            logger.warning(f"{func.__name__}: {e}")
+            interaction = next((arg for arg in args if isinstance(arg, discord.Interaction)), None)
+            if interaction is None:
+                raise
+            message = f"❌ L'API Minecraft est momentanément indisponible, réessayez dans {math.ceil(e.retry_in)} s."
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
         except APIError as e:
             logger.error(f"Erreur API dans {func.__name__}: {e}")
             raise
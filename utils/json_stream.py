@@ -0,0 +1,171 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Container, Dict, Iterable
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# Chaînes (ignorées en bloc) et délimiteurs de conteneurs
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+
+class _Buffer:
+    """Texte décodé au fil des morceaux reçus, consommé depuis le début."""
+    
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+    
+    async def fill(self) -> bool:
+        """Lit un morceau de plus ; retourne False en fin de flux."""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            self.text = self.text[self.pos:] + self._utf8.decode(b"", final=True)
+        else:
+            self.text = self.text[self.pos:] + self._utf8.decode(chunk)
+        self.pos = 0
+        return True
+    
+    async def peek(self) -> str:
+        """Premier caractère significatif (espaces ignorés), "" en fin de flux."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ""
+    
+    async def expect(self, char: str):
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"JSON inattendu : '{char}' attendu, '{found}' trouvé")
+        self.pos += 1
+    
+    async def value(self) -> Any:
+        """Décode la prochaine valeur JSON complète."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not await self.fill():
+                    raise
+                continue
+            # Un nombre en fin de tampon peut être tronqué : attendre la suite
+            if end == len(self.text) and not self.eof:
+                await self.fill()
+                continue
+            self.pos = end
+            return value
+
+async def iter_json_array(chunks: AsyncIterable[bytes], key: str) -> AsyncIterator[Any]:
+    """Produit un à un les éléments du tableau `key` d'un objet JSON reçu par morceaux.
+    
+    Seul l'élément en cours de décodage est gardé en mémoire ; les autres
+    clés de l'objet sont décodées puis ignorées.
+    """
+    buffer = _Buffer(chunks)
+    await buffer.expect("{")
+    if await buffer.peek() == "}":
+        return
+    
+    while True:
+        name = await buffer.value()
+        await buffer.expect(":")
+        if name != key:
+            await buffer.value()
+        else:
+            await buffer.expect("[")
+            if await buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield await buffer.value()
+                    separator = await buffer.peek()
+                    buffer.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError(f"JSON inattendu dans '{key}' : '{separator}'")
+        
+        separator = await buffer.peek()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON inattendu : '{separator}'")
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+def skip_value(text: str, pos: int) -> int:
+    """Position de fin de la valeur JSON commençant à `pos`, sans construire d'objets Python."""
+    pos = _skip_whitespace(text, pos)
+    if pos >= len(text) or text[pos] not in "[{":
+        return _decoder.raw_decode(text, pos)[1]
+    
+    depth = 0
+    for match in _STRUCTURE.finditer(text, pos):
+        token = match.group()
+        if token in "[{":
+            depth += 1
+        elif token in "]}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    raise ValueError("JSON inattendu : conteneur non fermé")
+
+def decode_object(text: str, raw_keys: Container[str] = ()) -> Dict[str, Any]:
+    """Décode un objet JSON en laissant les valeurs de `raw_keys` sous forme de bytes JSON bruts.
+    
+    Les sections volumineuses rarement lues ne sont ainsi décodées qu'à la
+    demande (voir `api.models.MinecraftPlayerStats`).
+    """
+    pos = _skip_whitespace(text, 0)
+    if text[pos:pos + 1] != "{":
+        raise ValueError("JSON inattendu : objet attendu")
+    result: Dict[str, Any] = {}
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos:pos + 1] == "}":
+        return result
+    
+    while True:
+        name, pos = _decoder.raw_decode(text, pos)
+        pos = _skip_whitespace(text, pos)
+        if text[pos:pos + 1] != ":":
+            raise ValueError(f"JSON inattendu après la clé '{name}'")
+        pos = _skip_whitespace(text, pos + 1)
+        if name in raw_keys:
+            end = skip_value(text, pos)
+            result[name] = text[pos:end].encode()
+        else:
+            result[name], end = _decoder.raw_decode(text, pos)
+        
+        pos = _skip_whitespace(text, end)
+        separator = text[pos:pos + 1]
+        pos = _skip_whitespace(text, pos + 1)
+        if separator == "}":
+            return result
+        if separator != ",":
+            raise ValueError(f"JSON inattendu : '{separator}'")
+
+def concat_arrays(arrays: Iterable[bytes]) -> bytes:
+    """Concatène des tableaux JSON bruts en un seul, sans décoder leurs éléments."""
+    items = []
+    for array in arrays:
+        array = array.strip()
+        if array[:1] != b"[" or array[-1:] != b"]":
+            raise ValueError("JSON inattendu : tableau attendu")
+        inner = array[1:-1].strip()
+        if inner:
+            items.append(inner)
+    return b"[" + b",".join(items) + b"]"
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Regroupe les appels concurrents identiques sur un seul calcul en vol.
+    
+    Tous les appelants d'une même clé attendent le même résultat (ou la même
+    exception). La clé est libérée dès que le calcul se termine.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécute `func` une seule fois pour tous les appelants concurrents de `key`."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        
+        # shield : l'annulation d'un appelant ne doit pas annuler les autres
+        return await asyncio.shield(future)
+    
+    def _release(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Évite l'avertissement "exception was never retrieved"
+        if not future.cancelled():
+            future.exception()
@@ -1,15 +1,156 @@
 import discord
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime
-from api.models import MinecraftPlayer, MinecraftPlayerStats, KillEvent, RankingType
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Dict, Sequence, Tuple, Optional
+from datetime import datetime, timezone
+from api.models import MinecraftPlayer, MinecraftPlayerStats, KillEvent, RankingType, ServerHealth
 from .embed_theme import EmbedTheme
 
+# Joueurs par page de la liste des joueurs
+PLAYER_LIST_PAGE_SIZE = 20
+
+class RenderedPages:
+    """Pages d'embeds rendues à la première consultation puis conservées."""
+    
+    def __init__(self, count: int, render: Callable[[int], discord.Embed]):
+        self._render = render
+        self._pages: List[Optional[discord.Embed]] = [None] * max(1, count)
+    
+    def __len__(self) -> int:
+        return len(self._pages)
+    
+    def __getitem__(self, index: int) -> discord.Embed:
+        page = self._pages[index]
+        if page is None:
+            page = self._pages[index] = self._render(index)
+        return page
+
+class PageCache:
+    """Pages rendues partagées entre les vues, par clé (ex. type de classement, version de l'instantané).
+    
+    Tant que la version des données ne change pas, paginer ne recalcule ni
+    ne réaffiche rien ; les entrées les plus anciennes sont évincées.
+    """
+    
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, RenderedPages]" = OrderedDict()
+    
+    def get(self, key: Optional[Hashable]) -> Optional[RenderedPages]:
+        """Pages de `key`, ou None (toujours None pour une clé None : données sans version)."""
+        if key is None:
+            return None
+        pages = self._entries.get(key)
+        if pages is not None:
+            self._entries.move_to_end(key)
+        return pages
+    
+    def put(self, key: Optional[Hashable], pages: RenderedPages):
+        if key is None:
+            return
+        self._entries[key] = pages
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class PaginatedView(discord.ui.View):
+    """Navigation par boutons dans des pages d'embeds, réservée à l'auteur de la commande."""
+    
+    def __init__(self, pages: RenderedPages, author_id: Optional[int] = None, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.author_id = author_id
+        self.index = 0
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+    
+    async def send(self, interaction: discord.Interaction):
+        """Envoie la première page (sans boutons s'il n'y en a qu'une)."""
+        if len(self.pages) == 1:
+            self.stop()
+            await interaction.followup.send(embed=self.pages[0])
+            return
+        self.message = await interaction.followup.send(embed=self.pages[0], view=self, wait=True)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.author_id is None or interaction.user.id == self.author_id:
+            return True
+        await interaction.response.send_message(
+            "Seul l'auteur de la commande peut changer de page.",
+            ephemeral=True
+        )
+        return False
+    
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+    
+    def _update_buttons(self):
+        last = len(self.pages) - 1
+        self.first_page.disabled = self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.last_page.disabled = self.index == last
+        self.page_indicator.label = f"{self.index + 1}/{last + 1}"
+    
+    async def _show(self, interaction: discord.Interaction, index: int):
+        self.index = max(0, min(index, len(self.pages) - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+    
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, 0)
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index - 1)
+    
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_indicator(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index + 1)
+    
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, len(self.pages) - 1)
+
 class MinecraftViews:
     """Classe pour la création des embeds Minecraft."""
     
     @staticmethod
-    def create_player_list_embed(players: List[MinecraftPlayer]) -> discord.Embed:
-        """Crée l'embed pour la liste des joueurs."""
+    def _set_data_age(embed: discord.Embed, footer: str, data_as_of: Optional[float]):
+        """Pied de page et date des données.
+        
+        Pour un instantané, l'âge est un horodatage relatif Discord : il reste
+        juste même quand l'embed est réaffiché depuis le cache des pages.
+        """
+        embed.set_footer(text=footer)
+        if data_as_of is None:
+            embed.timestamp = discord.utils.utcnow()
+            return
+        embed.timestamp = datetime.fromtimestamp(data_as_of, tz=timezone.utc)
+        age_line = f"{EmbedTheme.ICONS['time']} Données mises à jour <t:{int(data_as_of)}:R>"
+        embed.description = f"{embed.description}\n\n{age_line}" if embed.description else age_line
+    
+    @staticmethod
+    def _page_footer(text: str, page: Optional[Tuple[int, int]]) -> str:
+        return f"{text} · Page {page[0]}/{page[1]}" if page and page[1] > 1 else text
+    
+    @staticmethod
+    def create_player_list_embed(
+        players: Sequence[MinecraftPlayer],
+        data_as_of: Optional[float] = None,
+        start: int = 0,
+        total: Optional[int] = None,
+        page: Optional[Tuple[int, int]] = None
+    ) -> discord.Embed:
+        """Crée l'embed pour la liste des joueurs (ou une page de celle-ci, à partir de `start`)."""
         embed = discord.Embed(
             title=f"{EmbedTheme.ICONS['player']} Liste des joueurs Minecraft",
             color=EmbedTheme.MINECRAFT_COLOR
@@ -19,16 +160,38 @@ class MinecraftViews:
             embed.description = f"{EmbedTheme.ICONS['info']} Aucun joueur trouvé."
             return embed
         
-        player_list = "\n".join([f"• {player.player_name}" for player in players])
-        embed.add_field(name="Joueurs", value=player_list)
+        embed.description = "\n".join(
+            f"`{position}.` {player.player_name}"
+            for position, player in enumerate(players, start + 1)
+        )
         
-        embed.set_footer(text=f"Total: {len(players)} joueurs")
-        embed.timestamp = discord.utils.utcnow()
+        total = len(players) if total is None else total
+        MinecraftViews._set_data_age(embed, MinecraftViews._page_footer(f"Total: {total} joueurs", page), data_as_of)
         
         return embed
     
     @staticmethod
-    def create_stats_embed(player_name: str, stats: MinecraftPlayerStats) -> discord.Embed:
+    def create_player_list_pages(
+        players: Sequence[MinecraftPlayer],
+        data_as_of: Optional[float] = None,
+        page_size: int = PLAYER_LIST_PAGE_SIZE
+    ) -> RenderedPages:
+        """Liste complète des joueurs découpée en pages rendues à la demande."""
+        count = -(-len(players) // page_size)
+        return RenderedPages(count, lambda index: MinecraftViews.create_player_list_embed(
+            players[index * page_size:(index + 1) * page_size],
+            data_as_of,
+            start=index * page_size,
+            total=len(players),
+            page=(index + 1, count)
+        ))
+    
+    @staticmethod
+    def create_stats_embed(
+        player_name: str,
+        stats: MinecraftPlayerStats,
+        data_as_of: Optional[float] = None
+    ) -> discord.Embed:
         """Crée l'embed pour les stats d'un joueur."""
         embed = discord.Embed(
             title=f"{EmbedTheme.ICONS['stats']} Stats de {player_name}",
@@ -67,24 +230,62 @@ class MinecraftViews:
             inline=True
         )
         
-        embed.set_footer(text="Mis à jour")
-        embed.timestamp = discord.utils.utcnow()
+        MinecraftViews._set_data_age(embed, "Mis à jour", data_as_of)
         
         return embed
     
+    @staticmethod
+    def format_player_value(ranking_type: RankingType, value: float) -> str:
+        """Formate la valeur d'un classement issu de playersTable."""
+        if ranking_type == RankingType.PLAYTIME:
+            minutes = int(value) // 60_000
+            return f"{minutes // 60} h {minutes % 60:02d} min"
+        if ranking_type == RankingType.ACTIVITY:
+            return f"indice {value:.2f}"
+        if ranking_type == RankingType.PING:
+            return f"{value:g} ms"
+        return f"{value} sessions"
+    
+    @staticmethod
+    def _format_ranking_line(position: int, row: tuple, ranking_type: RankingType) -> str:
+        prefix = EmbedTheme.get_ranking_prefix(position)
+        if ranking_type.from_players_table:
+            player_name, value = row
+            return f"{prefix} **{player_name}** - {MinecraftViews.format_player_value(ranking_type, value)}"
+        
+        player_name, kills, deaths, score = row
+        if ranking_type == RankingType.KD_RATIO:
+            score_text = "∞" if score == float('inf') else f"{score:.2f}"
+            return f"{prefix} **{player_name}**\n   Kills: {kills} | Morts: {deaths} | K/D: {score_text}"
+        elif ranking_type == RankingType.DEATHS:
+            return f"{prefix} **{player_name}** - {deaths} Morts"
+        else:  # KILLS
+            return f"{prefix} **{player_name}** - {kills} Kills"
+    
     @staticmethod
     def create_ranking_embed(
-        ranking_data: List[tuple],
-        ranking_type: RankingType
+        ranking_data: Sequence[tuple],
+        ranking_type: RankingType,
+        period_label: Optional[str] = None,
+        data_as_of: Optional[float] = None,
+        start: int = 0,
+        page: Optional[Tuple[int, int]] = None
     ) -> discord.Embed:
-        """Crée l'embed pour le classement."""
+        """Crée l'embed pour le classement (global ou sur une période), ou une page à partir du rang `start + 1`."""
         titles = {
             RankingType.KD_RATIO: ("Ratio K/D", "Classement basé sur le ratio Kill/Death"),
             RankingType.KILLS: ("Nombre de Kills", "Classement basé sur le nombre total de kills"),
-            RankingType.DEATHS: ("Nombre de Morts", "Classement basé sur le nombre total de morts")
+            RankingType.DEATHS: ("Nombre de Morts", "Classement basé sur le nombre total de morts"),
+            RankingType.PLAYTIME: ("Temps de jeu", "Classement basé sur le temps de jeu actif"),
+            RankingType.ACTIVITY: ("Activité", "Classement basé sur l'indice d'activité de Plan"),
+            RankingType.PING: ("Ping", "Classement basé sur le ping moyen (le plus faible en tête)"),
+            RankingType.SESSIONS: ("Sessions", "Classement basé sur le nombre de sessions")
         }
         
         title, description = titles[ranking_type]
+        if period_label:
+            title = f"{title} ({period_label})"
+            description = f"{description} (période : {period_label})"
         
         embed = discord.Embed(
             title=f"{EmbedTheme.ICONS['stats']} Classement des Joueurs Minecraft - {title}",
@@ -100,30 +301,40 @@ class MinecraftViews:
             )
             return embed
         
-        ranking_text = ""
-        for i, (player_name, kills, deaths, score) in enumerate(ranking_data, 1):
-            prefix = EmbedTheme.get_ranking_prefix(i)
-            
-            if ranking_type == RankingType.KD_RATIO:
-                score_text = "∞" if score == float('inf') else f"{score:.2f}"
-                ranking_text += f"{prefix} **{player_name}**\n"
-                ranking_text += f"   Kills: {kills} | Morts: {deaths} | K/D: {score_text}\n\n"
-            elif ranking_type == RankingType.DEATHS:
-                ranking_text += f"{prefix} **{player_name}** - {deaths} Morts\n\n"
-            else:  # KILLS
-                ranking_text += f"{prefix} **{player_name}** - {kills} Kills\n\n"
+        # La description (4096 caractères) accueille une page complète, un champ (1024) non
+        lines = [
+            MinecraftViews._format_ranking_line(position, row, ranking_type)
+            for position, row in enumerate(ranking_data, start + 1)
+        ]
+        embed.description = f"{description}\n\n" + "\n\n".join(lines)
         
-        embed.add_field(
-            name="Classement",
-            value=ranking_text,
-            inline=False
+        MinecraftViews._set_data_age(
+            embed,
+            MinecraftViews._page_footer("Mis à jour automatiquement", page),
+            data_as_of
         )
         
-        embed.set_footer(text="Mis à jour automatiquement")
-        embed.timestamp = discord.utils.utcnow()
-        
         return embed
     
+    @staticmethod
+    def create_ranking_pages(
+        ranking_data: Sequence[tuple],
+        ranking_type: RankingType,
+        page_size: int = 10,
+        period_label: Optional[str] = None,
+        data_as_of: Optional[float] = None
+    ) -> RenderedPages:
+        """Classement complet découpé en pages rendues à la demande."""
+        count = -(-len(ranking_data) // page_size)
+        return RenderedPages(count, lambda index: MinecraftViews.create_ranking_embed(
+            ranking_data[index * page_size:(index + 1) * page_size],
+            ranking_type,
+            period_label,
+            data_as_of,
+            start=index * page_size,
+            page=(index + 1, count)
+        ))
+    
     @staticmethod
     def create_killfeed_embed(kill: KillEvent) -> discord.Embed:
         """Crée un embed pour un événement de kill."""
@@ -143,9 +354,33 @@ class MinecraftViews:
             timestamp=datetime.fromtimestamp(kill.timestamp / 1000) if kill.timestamp > 0 else datetime.now()
         )
         
-        embed.set_footer(text="Kill détecté automatiquement")
+        embed.set_footer(text=f"Kill détecté automatiquement · {kill.server}" if kill.server else "Kill détecté automatiquement")
         return embed
 
+    @staticmethod
+    def create_killfeed_summary_embed(kills: List[KillEvent]) -> discord.Embed:
+        """Crée un embed compact regroupant plusieurs kills (une ligne par kill)."""
+        lines = []
+        for kill in kills:
+            weapon_emoji = MinecraftViews._get_weapon_emoji(kill.weapon)
+            line = f"{weapon_emoji} **{kill.killer}** → **{kill.victim}** ({kill.weapon}"
+            if kill.distance > 0:
+                line += f", {kill.distance:.0f} m"
+            if kill.server:
+                line += f", {kill.server}"
+            lines.append(line + ")")
+        
+        last = kills[-1]
+        embed = discord.Embed(
+            title=f"💀 Kill Feed - {len(kills)} kills",
+            description="\n".join(lines),
+            color=EmbedTheme.ERROR_COLOR,
+            timestamp=datetime.fromtimestamp(last.timestamp / 1000) if last.timestamp > 0 else datetime.now()
+        )
+        
+        embed.set_footer(text="Kills détectés automatiquement")
+        return embed
+    
     @staticmethod
     def _get_weapon_emoji(weapon: str) -> str:
         """Retourne l'emoji approprié selon l'arme."""
@@ -167,7 +402,15 @@ class MinecraftViews:
             return "🗡️"
     
     @staticmethod
-    def create_killfeed_status_embed(is_active: bool, is_configured: bool) -> discord.Embed:
+    def create_killfeed_status_embed(
+        is_active: bool,
+        is_configured: bool,
+        interval: Optional[float] = None,
+        poll_histogram: Optional[List[Tuple[str, int]]] = None,
+        pipeline_stats: Optional[List[Dict]] = None,
+        server_health: Optional[List[ServerHealth]] = None,
+        subscriptions: Optional[List[Tuple[str, str, int, int]]] = None
+    ) -> discord.Embed:
         """Crée l'embed pour le statut du killfeed."""
         if not is_configured:
             status = f"{EmbedTheme.ICONS['error']} Non configuré"
@@ -182,5 +425,63 @@ class MinecraftViews:
             color=color
         )
         
+        if subscriptions:
+            subscriptions_text = "\n".join(
+                f"{channel} - {description} ({delivered} kills"
+                + (f", {dropped} perdus)" if dropped else ")")
+                for channel, description, delivered, dropped in subscriptions
+            )
+            embed.add_field(
+                name=f"{EmbedTheme.ICONS['info']} Canaux abonnés",
+                value=subscriptions_text[:1024],
+                inline=False
+            )
+        
+        if interval is not None:
+            embed.add_field(
+                name=f"{EmbedTheme.ICONS['time']} Intervalle de vérification",
+                value=f"{interval:.0f} secondes",
+                inline=False
+            )
+        
+        if poll_histogram and any(count for _, count in poll_histogram):
+            histogram_text = "\n".join(
+                f"`{label:>6}` {count}" for label, count in poll_histogram if count
+            )
+            embed.add_field(
+                name=f"{EmbedTheme.ICONS['stats']} Durée des requêtes",
+                value=histogram_text,
+                inline=False
+            )
+        
+        if pipeline_stats:
+            pipeline_text = "\n".join(
+                f"`{stage['name']:<7}` file {stage['queue_depth']} · "
+                f"{stage['throughput_per_min']:.1f}/min · {stage['avg_latency_ms']:.0f} ms"
+                for stage in pipeline_stats
+            )
+            embed.add_field(
+                name=f"{EmbedTheme.ICONS['info']} Pipeline",
+                value=pipeline_text,
+                inline=False
+            )
+        
+        if server_health and len(server_health) > 1:
+            health_lines = []
+            for health in server_health:
+                if health.consecutive_errors:
+                    health_lines.append(
+                        f"{EmbedTheme.ICONS['error']} **{health.name}** : {health.consecutive_errors} erreur(s) - {health.last_error}"
+                    )
+                else:
+                    health_lines.append(
+                        f"{EmbedTheme.ICONS['success']} **{health.name}** : {health.last_duration * 1000:.0f} ms"
+                    )
+            embed.add_field(
+                name=f"{EmbedTheme.ICONS['stats']} Serveurs",
+                value="\n".join(health_lines)[:1024],
+                inline=False
+            )
+        
         embed.timestamp = discord.utils.utcnow()
-        return embed 
\ No newline at end of file
+        return embed
\ No newline at end of file